@@ -0,0 +1,401 @@
+"""Benchmarks dos caminhos críticos do launcher, sem rede externa nem janela.
+
+Uso:
+    python benchmark.py                          # tudo, resultado em JSON na saída padrão
+    python benchmark.py --only download,hash     # só alguns grupos
+    python benchmark.py --output atual.json --compare anterior.json
+
+Sem DISPLAY, a grade de cards usa um stub de Tk e a medição até o primeiro
+quadro é pulada, a não ser que o Xvfb esteja instalado.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import statistics
+import tracemalloc
+import http.server
+from contextlib import contextmanager
+
+import main
+
+GROUPS = ("download", "hash", "cards", "catalog", "startup")
+
+# ====================== SERVIDOR LOCAL ======================
+class BenchmarkServer:
+    """Servidor HTTP local com o mesmo conteúdo em /range (aceita Range) e /plain (sem Range)"""
+    def __init__(self, size):
+        self.data = os.urandom(size)
+        self.md5 = hashlib.md5(self.data).hexdigest()
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        # Clientes que desistem do corpo (ex.: a sondagem sem Range) não são erro do benchmark
+        self.httpd.handle_error = lambda request, client_address: None
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def url(self, ranges=True):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/{'range' if ranges else 'plain'}/game.bin"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        data = memoryview(self.data)
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                ranges = self.path.startswith("/range/")
+                start, end = 0, len(data) - 1
+                header = self.headers.get("Range")
+                if ranges and header and header.startswith("bytes="):
+                    first, _, last = header[6:].partition("-")
+                    start = int(first)
+                    end = min(int(last), len(data) - 1) if last else len(data) - 1
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                else:
+                    self.send_response(200)
+                self.send_header("Accept-Ranges", "bytes" if ranges else "none")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.end_headers()
+                self.wfile.write(data[start:end + 1])
+
+        return Handler
+
+# ====================== TK ======================
+class StubWidget:
+    """Widget de Tk que aceita qualquer chamada; mede o custo da grade sem o servidor X"""
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    def winfo_height(self):
+        return main.Config.HEIGHT - 180
+
+class StubThumbnails:
+    def placeholder(self):
+        return None
+
+    def request(self, image_path, callback):
+        return None
+
+@contextmanager
+def virtual_display():
+    """Usa o DISPLAY atual, ou sobe um Xvfb temporário; None se nenhum estiver disponível"""
+    if os.environ.get("DISPLAY"):
+        yield os.environ["DISPLAY"]
+        return
+    if not shutil.which("Xvfb"):
+        yield None
+        return
+
+    display = ":97"
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ["DISPLAY"] = display
+    try:
+        yield display
+    finally:
+        del os.environ["DISPLAY"]
+        process.terminate()
+        process.wait()
+
+# ====================== BENCHMARKS ======================
+class Benchmarks:
+    @staticmethod
+    def timed(func, repeat):
+        """Executa func repeat vezes; retorna {"min", "median"} em segundos e o último resultado"""
+        times = []
+        result = None
+        for _ in range(repeat):
+            begin = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - begin)
+        return {"min": min(times), "median": statistics.median(times)}, result
+
+    @staticmethod
+    def throughput(size, timing):
+        return size / timing["median"] / (1024 * 1024)
+
+    @staticmethod
+    def download(args, workdir):
+        server = BenchmarkServer(args.size * 1024 * 1024)
+        results = {}
+        try:
+            for ranges in (True, False):
+                dest = os.path.join(workdir, "download.bin")
+
+                def run():
+                    for path in (dest, dest + ".part", dest + ".part.json"):
+                        if os.path.exists(path):
+                            os.remove(path)
+                    downloader = main.Downloader(server.url(ranges), dest, segments=args.segments,
+                                                 expected_digest=server.md5)
+                    downloader.run()
+                    return downloader
+
+                timing, downloader = Benchmarks.timed(run, args.repeat)
+                results["range" if ranges else "no_range"] = dict(
+                    timing,
+                    segments=len(downloader.ranges) or 1,
+                    mb_per_s=Benchmarks.throughput(len(server.data), timing))
+        finally:
+            server.close()
+            main.HttpClient.close_all()
+        return results
+
+    @staticmethod
+    def hash(args, workdir):
+        size = args.size * 1024 * 1024
+        path = os.path.join(main.Config.DOWNLOADS_DIR, "hash.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+
+        # O arquivo acabou de ser escrito: mede o hash com o page cache quente, não o disco
+        results = {}
+        timing, _ = Benchmarks.timed(lambda: main.Utils.md5(path), args.repeat)
+        results["utils_md5"] = dict(timing, mb_per_s=Benchmarks.throughput(size, timing))
+        for algo in main.HashEngine.ALGORITHMS:
+            timing, _ = Benchmarks.timed(lambda: main.HashEngine.hash_file(path, algo), args.repeat)
+            results[algo] = dict(timing, mb_per_s=Benchmarks.throughput(size, timing))
+        timing, _ = Benchmarks.timed(lambda: main.HashEngine.hash_blocks(path, "blake2b"), args.repeat)
+        results["blake2b_blocks"] = dict(timing, mb_per_s=Benchmarks.throughput(size, timing))
+
+        manager = main.GameManager()
+        game = {"title": "Benchmark", "exe_name": "hash.bin", "download_url": "",
+                "md5": main.HashEngine.hash_file(path, "md5")}
+        manager.catalog.add(game)
+        timing, ok = Benchmarks.timed(lambda: manager.verify_game(game, force=True), args.repeat)
+        results["verify_cold"] = dict(timing, ok=ok, mb_per_s=Benchmarks.throughput(size, timing))
+        timing, ok = Benchmarks.timed(lambda: manager.verify_game(game), args.repeat)
+        results["verify_cached"] = dict(timing, ok=ok)
+        return results
+
+    @staticmethod
+    def synthetic_games(count):
+        return [{
+            "id": f"jogo-{i}",
+            "title": f"Jogo Sintético {i}",
+            "exe_name": f"jogo_{i}.exe",
+            "download_url": f"http://127.0.0.1/jogo_{i}.exe",
+            "size": f"{(i % 50) + 1} GB",
+            "image": f"games/jogo_{i}.png",
+            "md5": hashlib.md5(str(i).encode()).hexdigest()
+        } for i in range(count)]
+
+    @staticmethod
+    def cards(args, workdir):
+        with virtual_display() as display:
+            if display:
+                root = main.tk.Tk()
+                root.geometry(f"{main.Config.WIDTH}x{main.Config.HEIGHT}")
+                parent = main.tk.Frame(root, width=main.Config.WIDTH, height=main.Config.HEIGHT - 180)
+                parent.pack(fill="both", expand=True)
+                root.update()
+                backend, flush = "tk", root.update_idletasks
+            else:
+                original = main.tk.Frame, main.tk.Label
+                main.tk.Frame = main.tk.Label = StubWidget
+                parent, backend, flush = StubWidget(), "stub", lambda: None
+
+            results = {"backend": backend}
+            try:
+                for count in args.games:
+                    games = Benchmarks.synthetic_games(count)
+
+                    def build():
+                        grid = main.CardGrid(parent, StubThumbnails(), is_installed=lambda game: False,
+                                             on_launch=lambda exe: None, on_download=lambda game: None)
+                        grid.set_games(games)
+                        flush()
+                        return grid
+
+                    timing, grid = Benchmarks.timed(build, args.repeat)
+                    step, _ = Benchmarks.timed(lambda: (grid.select((grid.selected_index + 1) % count), flush()),
+                                               args.repeat * 10)
+
+                    tracemalloc.start()
+                    build()
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    results[str(count)] = dict(timing, slots=len(grid.slots), peak_bytes=peak,
+                                               select_step=step["median"])
+            finally:
+                if display:
+                    root.destroy()
+                else:
+                    main.tk.Frame, main.tk.Label = original
+        return results
+
+    @staticmethod
+    def catalog(args, workdir):
+        results = {}
+        for count in args.games + [args.catalog_size]:
+            path = os.path.join(workdir, f"games_{count}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(Benchmarks.synthetic_games(count), f)
+
+            def load():
+                manager = main.GameManager()
+                manager.catalog_sync = main.CatalogSync(url="", cache_path=path,
+                                                        meta_path=path + ".meta")
+                manager.load_games()
+                return manager
+
+            timing, manager = Benchmarks.timed(load, args.repeat)
+            search, _ = Benchmarks.timed(lambda: manager.search("sintetico 12"), args.repeat)
+            results[str(count)] = dict(timing, games=len(manager.games), search=search["median"])
+        return results
+
+    STARTUP_SCRIPT = """
+import sys, time, json, os
+begin = time.perf_counter()
+sys.path.insert(0, {repo!r})
+import main
+imported = time.perf_counter()
+startup = main.StartupTimer()
+root = main.tk.Tk()
+app = main.GameLauncherUI(root, startup=startup)
+while not any(name == "primeiro quadro" for name, _, _ in startup.phases):
+    root.update()
+first_frame = time.perf_counter()
+print(json.dumps({{"import": imported - begin, "first_frame": first_frame - begin,
+                  "phases": {{name: duration for name, duration, _ in startup.phases if duration is not None}}}}))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+    @staticmethod
+    def startup(args, workdir):
+        with virtual_display() as display:
+            if not display:
+                return {"skipped": "sem DISPLAY nem Xvfb"}
+
+            script = Benchmarks.STARTUP_SCRIPT.format(repo=os.path.dirname(os.path.abspath(main.__file__)))
+            runs = []
+            for _ in range(args.repeat):
+                # Diretório limpo a cada execução: sem catálogo, miniaturas ou índices de antes
+                cwd = tempfile.mkdtemp(dir=workdir)
+                output = subprocess.run([sys.executable, "-c", script], cwd=cwd, capture_output=True,
+                                        text=True, timeout=60, check=True).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+
+        first_frames = [run["first_frame"] for run in runs]
+        return {
+            "min": min(first_frames),
+            "median": statistics.median(first_frames),
+            "import": statistics.median(run["import"] for run in runs),
+            "phases": runs[-1]["phases"]
+        }
+
+# ====================== RELATÓRIO ======================
+def flatten(results, prefix=""):
+    """{"hash": {"md5": {"median": 1}}} -> {"hash.md5.median": 1}, só valores numéricos"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+def compare(current, baseline_path, threshold=0.10):
+    """Lista as métricas que mudaram mais que threshold em relação a um resultado anterior"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = flatten(json.load(f)["results"])
+    lines = []
+    for name, value in sorted(flatten(current["results"]).items()):
+        old = baseline.get(name)
+        if old and abs(value - old) / old > threshold:
+            lines.append(f"{name:<40} {old:>14.6g} -> {value:<14.6g} ({(value - old) / old:+.0%})")
+    return lines
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(main.__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmarks do Game Launcher")
+    parser.add_argument("--only", default=",".join(GROUPS),
+                        help=f"grupos separados por vírgula ({', '.join(GROUPS)})")
+    parser.add_argument("--size", type=int, default=64, help="tamanho do arquivo de download/hash em MiB")
+    parser.add_argument("--segments", type=int, default=main.Config.DOWNLOAD_SEGMENTS)
+    parser.add_argument("--games", default="10,1000,10000", help="tamanhos de catálogo para a grade de cards")
+    parser.add_argument("--catalog-size", type=int, default=50000, help="maior catálogo do benchmark de leitura")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: saída padrão)")
+    parser.add_argument("--compare", help="resultado anterior para comparar")
+    args = parser.parse_args(argv)
+    args.only = [group for group in args.only.split(",") if group]
+    args.games = [int(count) for count in args.games.split(",") if count]
+    return args
+
+def run(argv=None):
+    args = parse_args(argv)
+    unknown = set(args.only) - set(GROUPS)
+    if unknown:
+        raise SystemExit(f"Grupos desconhecidos: {', '.join(sorted(unknown))}")
+
+    # Tudo que o GameManager cria ou lê (assets/, downloads/, índices) fica no diretório temporário
+    workdir = tempfile.mkdtemp(prefix="launcher-bench-")
+    main.Config.DOWNLOADS_DIR = os.path.join(workdir, "downloads")
+    main.Config.STORE_DIR = os.path.join(main.Config.DOWNLOADS_DIR, ".store")
+    main.Config.ASSETS_DIR = os.path.join(workdir, "assets")
+    main.Config.THUMBNAILS_DIR = os.path.join(main.Config.ASSETS_DIR, ".thumbs")
+    main.Config.CATALOG_FILE = os.path.join(main.Config.ASSETS_DIR, "games.json")
+    main.Config.CATALOG_META_FILE = os.path.join(main.Config.ASSETS_DIR, "games.meta.json")
+    main.Config.CATALOG_URL = ""
+    os.makedirs(main.Config.DOWNLOADS_DIR, exist_ok=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "parameters": {"size_mib": args.size, "segments": args.segments, "games": args.games,
+                       "catalog_size": args.catalog_size, "repeat": args.repeat},
+        "results": {}
+    }
+    try:
+        for group in GROUPS:
+            if group in args.only:
+                print(f"[benchmark] {group}...", file=sys.stderr)
+                report["results"][group] = getattr(Benchmarks, group)(args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        changes = compare(report, args.compare)
+        print("\n".join(changes) if changes else "Nenhuma métrica mudou mais de 10%.", file=sys.stderr)
+
+if __name__ == "__main__":
+    run()
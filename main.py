@@ -1,12 +1,9 @@
 import os
 import sys
 import ctypes
-import requests
+import importlib
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
-import pygame
-import pygame.joystick
 import subprocess
 import threading
 import time
@@ -15,6 +12,46 @@ from io import BytesIO
 import traceback
 import json
 import hashlib
+import heapq
+import queue
+import bisect
+import re
+import unicodedata
+import codecs
+import shutil
+import stat
+import struct
+import tarfile
+import zlib
+import bz2
+from urllib.parse import urlsplit
+import mmap
+import sqlite3
+import cProfile
+import pstats
+import http.server
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from collections import OrderedDict, deque, namedtuple
+
+# ====================== IMPORTAÇÕES SOB DEMANDA ======================
+class LazyModule:
+    """Importa o módulo apenas no primeiro acesso a um atributo"""
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+# pygame, Pillow e requests pesam na inicialização e não são necessários para o primeiro quadro
+pygame = LazyModule("pygame")
+requests = LazyModule("requests")
+Image = LazyModule("PIL.Image")
+ImageTk = LazyModule("PIL.ImageTk")
 
 # ====================== CONFIGURAÇÕES ======================
 class Config:
@@ -35,6 +72,64 @@ class Config:
     DOWNLOADS_DIR = "downloads"
     ASSETS_DIR = "assets"
     CONFIG_FILE = "config.json"
+    THUMBNAILS_DIR = os.path.join(ASSETS_DIR, ".thumbs")
+    
+    # Catálogo
+    CATALOG_URL = ""  # vazio = usa apenas assets/games.json
+    CATALOG_FILE = os.path.join(ASSETS_DIR, "games.json")
+    CATALOG_META_FILE = os.path.join(ASSETS_DIR, "games.meta.json")
+    CATALOG_BATCH_SIZE = 500
+    
+    # Rede
+    HTTP_POOL_SIZE = 16  # conexões mantidas por host
+    HTTP_CONNECT_TIMEOUT = 10
+    HTTP_READ_TIMEOUT = 30
+    HTTP_RETRIES = 3
+    HTTP_BACKOFF = 0.5  # segundos; dobra a cada nova tentativa
+    
+    # Downloads
+    DOWNLOAD_SEGMENTS = 4
+    MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    DOWNLOAD_MIN_CHUNK_SIZE = 16 * 1024
+    DOWNLOAD_MAX_CHUNK_SIZE = 4 * 1024 * 1024
+    INSTALL_PIPE_SIZE = 32 * 1024 * 1024  # bytes em trânsito entre download e extração
+    DOWNLOAD_RETRIES = 3
+    MAX_CONCURRENT_DOWNLOADS = 2
+    MIRROR_PROBE_BYTES = 256 * 1024   # amostra baixada de cada espelho para medir a vazão
+    MIRROR_STALL_TIMEOUT = 10         # segundos sem dados antes de trocar de espelho
+    MIRROR_MAX_FAILURES = 2           # falhas até um espelho ser descartado (se houver outros)
+    MIRROR_RANGES_PER_SEGMENT = 4     # com espelhos, segmentos menores para os mais rápidos pegarem mais
+    BANDWIDTH_LIMIT = 0  # bytes/s somados de todos os downloads; 0 = sem limite
+    CLI_PROGRESS_INTERVAL = 2  # segundos entre linhas de progresso de um mesmo download na linha de comando
+    INTEGRITY_CACHE_FILE = ".integrity.json"
+    INSTALL_INDEX_FILE = ".installs.db"
+    STORE_DIR = os.path.join(DOWNLOADS_DIR, ".store")
+    STORE_MIN_FILE_SIZE = 64 * 1024  # arquivos menores não valem a deduplicação
+    
+    # Hash
+    HASH_BUFFER_SIZE = 4 * 1024 * 1024
+    HASH_BLOCK_SIZE = 4 * 1024 * 1024
+    HASH_WORKERS = 0  # 0 = um por núcleo
+    
+    # Miniaturas
+    THUMBNAIL_WORKERS = 4
+    PREFETCH_DWELL_MS = 350                 # tempo com o card focado antes de preparar o lançamento
+    PREFETCH_MAX_BYTES = 256 * 1024 * 1024  # quanto do executável e dos dados levar ao cache do sistema
+    PREFETCH_NEIGHBOR_ROWS = 2              # linhas vizinhas com miniaturas decodificadas antecipadamente
+    THUMBNAIL_MEMORY_BUDGET = 64 * 1024 * 1024  # bytes de PhotoImage mantidos em memória
+    
+    # Métricas
+    METRICS_FILE = ""        # arquivo no formato texto do Prometheus (ex.: coletor textfile do node_exporter)
+    METRICS_PORT = 0         # endpoint HTTP local em 127.0.0.1:<porta>/metrics; 0 = desligado
+    METRICS_INTERVAL = 15    # segundos entre gravações do arquivo
+    PROFILE_DIR = "profiles"
+    
+    # Controle
+    STICK_PRESS_THRESHOLD = 0.6   # analógico além disso conta como direção pressionada
+    STICK_DEADZONE = 0.3          # ...e só solta ao voltar para dentro desta zona
+    INPUT_REPEAT_DELAY = 0.4      # segundos segurando antes de repetir
+    INPUT_REPEAT_INTERVAL = 0.12  # segundos entre repetições
     
     # Sons
     SOUNDS = {
@@ -45,153 +140,3860 @@ class Config:
         "navigate": "audio/navigate.wav"
     }
 
-# ====================== UTILITÁRIOS ======================
-class Utils:
-    @staticmethod
-    def is_admin():
-        try:
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
-            return False
+# ====================== UTILITÁRIOS ======================
+class Utils:
+    @staticmethod
+    def is_admin():
+        try:
+            return ctypes.windll.shell32.IsUserAnAdmin()
+        except:
+            return False
+
+    @staticmethod
+    def run_as_admin():
+        ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, " ".join(sys.argv), None, None, 1)
+        sys.exit()
+
+    @staticmethod
+    def hsv_to_rgb(h, s, v):
+        h_i = int(h*6)
+        f = h*6 - h_i
+        p = v * (1 - s)
+        q = v * (1 - f*s)
+        t = v * (1 - (1 - f)*s)
+        
+        if h_i == 0: r, g, b = v, t, p
+        elif h_i == 1: r, g, b = q, v, p
+        elif h_i == 2: r, g, b = p, v, t
+        elif h_i == 3: r, g, b = p, q, v
+        elif h_i == 4: r, g, b = t, p, v
+        else: r, g, b = v, p, q
+            
+        return f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
+
+    @staticmethod
+    def format_bytes(count):
+        for unit in ("B", "KB", "MB", "GB"):
+            if count < 1024:
+                return f"{count:.1f} {unit}" if unit != "B" else f"{int(count)} B"
+            count /= 1024
+        return f"{count:.1f} TB"
+
+    @staticmethod
+    def format_duration(seconds):
+        seconds = int(seconds)
+        if seconds >= 3600:
+            return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+        return f"{seconds // 60}:{seconds % 60:02d}"
+
+    @staticmethod
+    def lerp_color(start, end, t):
+        """Interpola duas cores "#rrggbb" (t entre 0 e 1)"""
+        a = [int(start[i:i+2], 16) for i in (1, 3, 5)]
+        b = [int(end[i:i+2], 16) for i in (1, 3, 5)]
+        r, g, b = (int(x + (y - x) * t) for x, y in zip(a, b))
+        return f"#{r:02x}{g:02x}{b:02x}"
+
+    @staticmethod
+    def md5(file_path):
+        return HashEngine.hash_file(file_path, "md5")
+
+# ====================== MEDIÇÃO DE INICIALIZAÇÃO ======================
+class StartupTimer:
+    """Mede as fases da inicialização; o relatório só é impresso com --startup-report"""
+    FLAG = "--startup-report"
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []
+        self._lock = threading.Lock()
+
+    def mark(self, name):
+        """Fecha uma fase sequencial que começou na marca anterior"""
+        with self._lock:
+            now = time.perf_counter()
+            duration = now - self.last
+            self.last = now
+        self._record(name, duration, now)
+
+    @contextmanager
+    def phase(self, name):
+        """Mede uma fase isolada, como as que rodam em segundo plano"""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._record(name, end - begin, end)
+
+    def event(self, name):
+        """Registra um marco sem duração própria (ex.: fim de uma carga assíncrona)"""
+        self._record(name, None, time.perf_counter())
+
+    def _record(self, name, duration, end):
+        with self._lock:
+            self.phases.append((name, duration, end - self.start))
+        if self.enabled:
+            took = "       —   " if duration is None else f"{duration * 1000:8.1f} ms"
+            print(f"[startup] {name:<24} {took}   (t+{(end - self.start) * 1000:.1f} ms)")
+
+# ====================== MÉTRICAS ======================
+class Counter:
+    """Contador monotônico, opcionalmente separado por rótulos"""
+    TYPE = "counter"
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self.values.items()]
+
+class Histogram:
+    """Histograma de durações (em segundos) com os buckets cumulativos do Prometheus"""
+    TYPE = "histogram"
+    DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name, help, buckets=None):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets or self.DEFAULT_BUCKETS)
+        self.series = {}  # rótulos -> [contagem por bucket (+Inf no fim), soma, total]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def timer(self, **labels):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - begin, **labels)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in self.series.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += bucket_count
+                    samples.append((self.name + "_bucket", key + (("le", str(bound)),), cumulative))
+                samples.append((self.name + "_sum", key, total))
+                samples.append((self.name + "_count", key, count))
+        return samples
+
+class Metrics:
+    """Registro global de métricas, exportado como texto do Prometheus (arquivo ou HTTP local)"""
+    _registry = OrderedDict()
+    _lock = threading.Lock()
+    _server = None
+    _writer_stop = threading.Event()
+
+    @staticmethod
+    def counter(name, help):
+        return Metrics._register(Counter, name, help)
+
+    @staticmethod
+    def histogram(name, help, buckets=None):
+        return Metrics._register(Histogram, name, help, buckets)
+
+    @staticmethod
+    def _register(kind, name, help, *args):
+        with Metrics._lock:
+            metric = Metrics._registry.get(name)
+            if metric is None:
+                metric = Metrics._registry[name] = kind(name, help, *args)
+            return metric
+
+    @staticmethod
+    def render():
+        lines = []
+        with Metrics._lock:
+            metrics = list(Metrics._registry.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            for name, labels, value in metric.samples():
+                label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def write(path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(Metrics.render())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def start_export():
+        """Liga as saídas configuradas em Config.METRICS_FILE / Config.METRICS_PORT"""
+        if Config.METRICS_FILE:
+            Metrics._writer_stop.clear()
+            threading.Thread(target=Metrics._write_loop, daemon=True).start()
+        
+        if Config.METRICS_PORT and Metrics._server is None:
+            class Handler(http.server.BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = Metrics.render().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                
+                def log_message(self, *args):
+                    pass
+            
+            try:
+                Metrics._server = http.server.ThreadingHTTPServer(("127.0.0.1", Config.METRICS_PORT), Handler)
+                threading.Thread(target=Metrics._server.serve_forever, daemon=True).start()
+            except OSError as e:
+                print(f"Erro ao abrir o endpoint de métricas: {e}")
+
+    @staticmethod
+    def stop_export():
+        Metrics._writer_stop.set()
+        if Metrics._server:
+            Metrics._server.shutdown()
+            Metrics._server.server_close()
+            Metrics._server = None
+        if Config.METRICS_FILE:
+            Metrics._write_safe()
+
+    @staticmethod
+    def _write_loop():
+        while not Metrics._writer_stop.wait(Config.METRICS_INTERVAL):
+            Metrics._write_safe()
+
+    @staticmethod
+    def _write_safe():
+        try:
+            Metrics.write(Config.METRICS_FILE)
+        except OSError as e:
+            print(f"Erro ao gravar métricas: {e}")
+
+# Métricas dos caminhos críticos
+DOWNLOAD_BYTES = Metrics.counter("launcher_download_bytes_total", "Bytes recebidos pelos downloads")
+DOWNLOAD_WRITE_SECONDS = Metrics.histogram(
+    "launcher_download_chunk_write_seconds", "Tempo de gravação de cada bloco baixado",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+HASH_SECONDS = Metrics.histogram("launcher_hash_seconds", "Duração do hash de um arquivo")
+CARD_RENDER_SECONDS = Metrics.histogram("launcher_card_render_seconds", "Duração da montagem da grade de cards")
+THUMBNAIL_DECODE_SECONDS = Metrics.histogram(
+    "launcher_thumbnail_decode_seconds", "Leitura ou geração de uma miniatura")
+INPUT_LATENCY_SECONDS = Metrics.histogram(
+    "launcher_input_latency_seconds", "Do evento do controle até o quadro redesenhado")
+FRAME_SECONDS = Metrics.histogram("launcher_frame_seconds", "Duração de cada quadro de animação do Tk")
+DROPPED_FRAMES = Metrics.counter("launcher_dropped_frames_total", "Quadros de animação pulados por atraso")
+
+class Profiler:
+    """Captura opcional com cProfile das ações escolhidas em --profile=acao1,acao2.
+    
+    Cada ação acumula um perfil, gravado em Config.PROFILE_DIR ao sair.
+    """
+    FLAG = "--profile="
+    actions = set()
+    profiles = {}
+    _active = False
+
+    @staticmethod
+    def configure(argv):
+        for arg in argv:
+            if arg.startswith(Profiler.FLAG):
+                Profiler.actions.update(name for name in arg[len(Profiler.FLAG):].split(",") if name)
+
+    @staticmethod
+    @contextmanager
+    def capture(action):
+        profile = None
+        # Perfis aninhados disputariam o mesmo gancho do interpretador: vale só o mais externo
+        if action in Profiler.actions and not Profiler._active:
+            profile = Profiler.profiles.get(action)
+            if profile is None:
+                profile = Profiler.profiles[action] = cProfile.Profile()
+        if profile is None:
+            yield
+            return
+        
+        Profiler._active = True
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            Profiler._active = False
+
+    @staticmethod
+    def dump():
+        if not Profiler.profiles:
+            return
+        os.makedirs(Config.PROFILE_DIR, exist_ok=True)
+        for action, profile in Profiler.profiles.items():
+            path = os.path.join(Config.PROFILE_DIR, f"{action}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+            profile.dump_stats(path)
+            print(f"[profile] {action}: {path}")
+            pstats.Stats(profile).sort_stats("cumulative").print_stats(15)
+
+# ====================== HASH ======================
+class HashEngine:
+    """Hash de arquivos grandes: leitura via mmap, vários algoritmos e modo em blocos paralelo"""
+    # Ordem de preferência quando o catálogo informa mais de um digest
+    ALGORITHMS = ("blake2b", "sha256", "md5")
+
+    @staticmethod
+    def new(algo):
+        if algo not in HashEngine.ALGORITHMS:
+            raise ValueError(f"Algoritmo de hash não suportado: {algo}")
+        return hashlib.new(algo)
+
+    @staticmethod
+    def expected_digest(game):
+        """Retorna (algoritmo, digest) mais forte declarado no catálogo, ou None"""
+        for algo in HashEngine.ALGORITHMS:
+            if game.get(algo):
+                return algo, game[algo].lower()
+        return None
+
+    @staticmethod
+    def hash_file(file_path, algo="md5", should_continue=None):
+        """Digest do arquivo; levanta DownloadCancelled se should_continue() ficar falso no meio"""
+        return HashEngine.hash_file_multi(file_path, (algo,), should_continue)[algo]
+
+    @staticmethod
+    def hash_file_multi(file_path, algos, should_continue=None):
+        """Digests de vários algoritmos numa única leitura do arquivo: {algoritmo: digest}"""
+        hasher = MultiHasher(*algos)
+        buffer_size = Config.HASH_BUFFER_SIZE
+        
+        with HASH_SECONDS.timer(algo="+".join(hasher.algos)), HashEngine._mapped(file_path) as (view, f):
+            if view is not None:
+                for offset in range(0, len(view), buffer_size):
+                    if should_continue and not should_continue():
+                        raise DownloadCancelled()
+                    with view[offset:offset + buffer_size] as block:
+                        hasher.update(block)
+            else:
+                # Sem mmap: um único buffer reaproveitado com readinto
+                buf = bytearray(buffer_size)
+                buf_view = memoryview(buf)
+                while True:
+                    if should_continue and not should_continue():
+                        raise DownloadCancelled()
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    hasher.update(buf_view[:n])
+        return {algo: hasher.hexdigest(algo) for algo in hasher.algos}
+
+    @staticmethod
+    def hash_blocks(file_path, algo="md5", block_size=None, workers=None):
+        """Digest do arquivo inteiro e de cada bloco de tamanho fixo.
+        
+        Cada bloco é lido uma única vez: o pool calcula o digest do bloco (o hashlib
+        libera o GIL) e uma thread dedicada alimenta o digest completo, em ordem, com
+        os mesmos bytes. No máximo 2 * workers blocos ficam em trânsito.
+        """
+        block_size = block_size or Config.HASH_BLOCK_SIZE
+        workers = workers or Config.HASH_WORKERS or os.cpu_count() or 1
+        whole = HashEngine.new(algo)
+        in_flight = deque()
+        blocks = []
+        
+        def collect():
+            block, block_future, whole_future = in_flight.popleft()
+            blocks.append(block_future.result())
+            whole_future.result()
+            if isinstance(block, memoryview):
+                block.release()
+        
+        with HASH_SECONDS.timer(algo=algo), HashEngine._mapped(file_path) as (view, f), \
+                ThreadPoolExecutor(max_workers=workers) as pool, \
+                ThreadPoolExecutor(max_workers=1) as sequential:
+            if view is not None:
+                reader = (view[offset:offset + block_size] for offset in range(0, len(view), block_size))
+            else:
+                reader = iter(lambda: f.read(block_size), b"")
+            
+            for block in reader:
+                if len(in_flight) >= 2 * workers:
+                    collect()
+                in_flight.append((block,
+                                  pool.submit(HashEngine._block_digest, algo, block),
+                                  sequential.submit(whole.update, block)))
+            
+            # As views dos blocos precisam ser liberadas antes de o mmap ser fechado
+            while in_flight:
+                collect()
+        
+        return {
+            "algo": algo,
+            "size": os.path.getsize(file_path),
+            "block_size": block_size,
+            "digest": whole.hexdigest(),
+            "blocks": blocks
+        }
+
+    @staticmethod
+    def _block_digest(algo, block):
+        hasher = HashEngine.new(algo)
+        hasher.update(block)
+        return hasher.hexdigest()
+
+    @staticmethod
+    @contextmanager
+    def _mapped(file_path):
+        """Abre o arquivo e devolve (memoryview do mmap, arquivo); a view é None se não der para mapear"""
+        with open(file_path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Arquivo vazio ou sistema sem mmap
+                yield None, f
+                return
+            
+            view = memoryview(mm)
+            try:
+                yield view, f
+            finally:
+                view.release()
+                mm.close()
+
+class MultiHasher:
+    """Vários algoritmos alimentados com os mesmos bytes, numa passada só; None é ignorado"""
+    def __init__(self, *algos):
+        self._hashers = {algo: HashEngine.new(algo) for algo in algos if algo}
+        self.algos = tuple(self._hashers)
+
+    def update(self, data):
+        for hasher in self._hashers.values():
+            hasher.update(data)
+
+    def hexdigest(self, algo):
+        return self._hashers[algo].hexdigest()
+
+# ====================== REDE ======================
+class HttpClient:
+    """Sessões HTTP compartilhadas, uma por host, com pool de conexões keep-alive, timeouts e retry"""
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+    _sessions = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def session(url):
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with HttpClient._lock:
+            session = HttpClient._sessions.get(host)
+            if session is None:
+                session = HttpClient._create_session()
+                HttpClient._sessions[host] = session
+        return session
+
+    @staticmethod
+    def _create_session():
+        # Falhas transitórias (conexão, 5xx, 429) são repetidas com backoff exponencial
+        retry = requests.adapters.Retry(
+            total=Config.HTTP_RETRIES,
+            backoff_factor=Config.HTTP_BACKOFF,
+            status_forcelist=HttpClient.RETRY_STATUS,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=Config.HTTP_POOL_SIZE,
+            max_retries=retry)
+        
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = "GameLauncherPremium"
+        return session
+
+    @staticmethod
+    def get(url, **kwargs):
+        kwargs.setdefault("timeout", (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT))
+        return HttpClient.session(url).get(url, **kwargs)
+
+    @staticmethod
+    def close_all():
+        with HttpClient._lock:
+            sessions = list(HttpClient._sessions.values())
+            HttpClient._sessions.clear()
+        for session in sessions:
+            session.close()
+
+# ====================== CACHE DE INTEGRIDADE ======================
+class IntegrityCache:
+    """Manifesto persistente de digests verificados, chaveado por caminho, tamanho, mtime e inode"""
+    def __init__(self, path=None):
+        self.path = path or os.path.join(Config.DOWNLOADS_DIR, Config.INTEGRITY_CACHE_FILE)
+        self._lock = threading.Lock()
+        self._batch_depth = 0
+        self._dirty = False
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except:
+            return {}
+
+    @contextmanager
+    def batch(self):
+        """Agrupa os registros feitos dentro do bloco numa única gravação do arquivo, ao sair"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._dirty:
+                    self._save()
+
+    @staticmethod
+    def _signature(file_path):
+        st = os.stat(file_path)
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def lookup(self, file_path, algo):
+        """Retorna o digest salvo se o arquivo não mudou desde a última verificação"""
+        try:
+            signature = self._signature(file_path)
+        except OSError:
+            return None
+        
+        with self._lock:
+            entry = self.entries.get(os.path.abspath(file_path))
+        if entry and entry["signature"] == signature and entry["algo"] == algo:
+            return entry["digest"]
+        return None
+
+    def record(self, file_path, algo, digest):
+        entry = {
+            "signature": self._signature(file_path),
+            "algo": algo,
+            "digest": digest,
+            "verified_at": time.time()
+        }
+        with self._lock:
+            self.entries[os.path.abspath(file_path)] = entry
+            self._save()
+
+    def verify_recorded(self, file_path, force=False):
+        """Confere o arquivo contra o digest registrado na instalação (sem registro, não há o que comparar)"""
+        with self._lock:
+            entry = self.entries.get(os.path.abspath(file_path))
+        if entry is None:
+            return True
+        
+        try:
+            if not force and entry["signature"] == self._signature(file_path):
+                return True
+            digest = HashEngine.hash_file(file_path, entry["algo"])
+        except OSError:
+            return False
+        
+        if digest != entry["digest"]:
+            return False
+        self.record(file_path, entry["algo"], digest)
+        return True
+
+    def invalidate(self, file_path):
+        with self._lock:
+            if self.entries.pop(os.path.abspath(file_path), None) is not None:
+                self._save()
+
+    def entry(self, file_path):
+        """Registro salvo do arquivo (sem tocar o disco), ou None"""
+        with self._lock:
+            return self.entries.get(os.path.abspath(file_path))
+
+    def _save(self):
+        # Dentro de batch() o arquivo só é regravado uma vez, no fim
+        if self._batch_depth:
+            self._dirty = True
+            return
+        self._dirty = False
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+# ====================== ARMAZENAMENTO POR CONTEÚDO ======================
+class ContentStore:
+    """Deduplicação por hash forte dos arquivos instalados; cada caminho instalado conta como
+    uma referência ao conteúdo.
+    
+    Onde o sistema de arquivos tem reflink, o conteúdo fica em .store/objects e as instalações
+    são cópias sob demanda dele, sem custo de espaço. Sem reflink não há objetos (seriam uma
+    segunda cópia de cada arquivo): o índice aponta para as instalações que têm o conteúdo e
+    uma nova instalação é copiada de uma delas em vez de baixada. Nunca há hardlink: um jogo
+    que altera os próprios arquivos no lugar não muda as outras instalações.
+    """
+    FICLONE = 0x40049409
+    # O conteúdo é sempre chaveado por um hash forte; digests de outros algoritmos
+    # (o md5 do catálogo, por exemplo) servem só como apelido para encontrá-lo
+    ALGO = "blake2b"
+
+    def __init__(self, root=None):
+        self.root = root or Config.STORE_DIR
+        self.index_path = os.path.join(self.root, "refs.json")
+        self._lock = threading.Lock()
+        self._can_reflink = None
+        index = self._load()
+        self.refs = index.get("refs", {})        # caminho instalado -> ["blake2b:digest", tamanho, mtime_ns]
+        self.objects = index.get("objects", {})  # "blake2b:digest" -> [tamanho, mtime_ns], só com reflink
+        self.aliases = index.get("aliases", {})  # "md5:digest" -> "blake2b:digest"
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except:
+            return {}
+
+    def object_path(self, algo, digest):
+        return os.path.join(self.root, "objects", algo, digest[:2], digest)
+
+    def _object_for(self, key):
+        algo, digest = key.split(":", 1)
+        return self.object_path(algo, digest)
+
+    def _key_for(self, algo, digest):
+        key = f"{algo}:{digest.lower()}"
+        return key if algo == self.ALGO else self.aliases.get(key, key)
+
+    @staticmethod
+    def _signature(path):
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+
+    def _valid_object(self, key):
+        """Um objeto alterado depois de guardado deixa de valer"""
+        try:
+            return self.objects.get(key) == self._signature(self._object_for(key))
+        except OSError:
+            return False
+
+    def _valid_ref(self, path):
+        """A instalação ainda tem o conteúdo registrado: não foi apagada nem alterada"""
+        try:
+            return self.refs[path][1:] == self._signature(path)
+        except (KeyError, OSError):
+            return False
+
+    def _source_for(self, key):
+        """De onde copiar o conteúdo: o objeto, ou uma instalação que ainda o tenha"""
+        if self._valid_object(key):
+            return self._object_for(key)
+        for path, entry in self.refs.items():
+            if entry[0] == key and self._valid_ref(path):
+                return path
+        return None
+
+    def _live_keys(self):
+        return {entry[0] for entry in self.refs.values()}
+
+    def materialize(self, algo, digest, dest_path):
+        """Cria dest_path a partir do conteúdo já presente; False se nenhum arquivo local o tem"""
+        dest_path = os.path.abspath(dest_path)
+        with self._lock:
+            key = self._key_for(algo, digest)
+            source = self._source_for(key)
+            if source is None:
+                return False
+            if source != dest_path:
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                self._replace_with_clone(source, dest_path)
+            self.refs[dest_path] = [key, *self._signature(dest_path)]
+            self._save()
+        return True
+
+    def ingest(self, file_path, digest, alias=None):
+        """Registra um arquivo recém-instalado pelo digest ALGO calculado no download;
+        alias é o (algoritmo, digest) do catálogo, que passa a encontrar o mesmo conteúdo"""
+        if alias and alias[0] != self.ALGO:
+            alias = f"{alias[0]}:{alias[1].lower()}"
+        else:
+            alias = None
+        with self._lock:
+            self._add(file_path, f"{self.ALGO}:{digest.lower()}", alias)
+            self._save()
+
+    def ingest_tree(self, root, digests):
+        """Registra os arquivos de uma instalação extraída de pacote, gravando o índice uma vez só.
+        
+        digests: caminho relativo a root -> digest ALGO, calculado durante a extração.
+        """
+        try:
+            for rel_path, digest in digests.items():
+                path = os.path.join(root, rel_path)
+                if os.path.islink(path) or os.path.getsize(path) < Config.STORE_MIN_FILE_SIZE:
+                    continue
+                with self._lock:
+                    self._add(path, f"{self.ALGO}:{digest}")
+        finally:
+            with self._lock:
+                self._save()
+
+    def _add(self, file_path, key, alias=None):
+        """Registra file_path como referência ao conteúdo key, criando o objeto se o reflink permitir"""
+        file_path = os.path.abspath(file_path)
+        if self._valid_object(key):
+            if self.refs.get(file_path, [None])[0] != key:
+                # Conteúdo já guardado: o reflink do objeto libera o espaço da cópia baixada
+                self._replace_with_reflink(self._object_for(key), file_path)
+        elif self._can_reflink is not False:
+            obj = self._object_for(key)
+            self._remove(obj)
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            self._can_reflink = self._reflink(file_path, obj)
+            if self._can_reflink:
+                # Somente leitura: o objeto só muda se alguém insistir, e aí _valid_object percebe
+                os.chmod(obj, stat.S_IMODE(os.stat(obj).st_mode) & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+                self.objects[key] = self._signature(obj)
+        if alias:
+            self.aliases[alias] = key
+        self.refs[file_path] = [key, *self._signature(file_path)]
+
+    def release(self, file_path):
+        """Remove a referência do caminho; o objeto é apagado quando ninguém mais o usa"""
+        self.release_tree(file_path)
+
+    def release_tree(self, root):
+        root = os.path.abspath(root)
+        with self._lock:
+            released = [path for path in self.refs
+                        if path == root or path.startswith(root + os.sep)]
+            if not released:
+                return
+            keys = {self.refs.pop(path)[0] for path in released}
+            live = self._live_keys()
+            for key in keys - live:
+                self._drop_object(key)
+            self._prune_aliases(live)
+            self._save()
+
+    def gc(self):
+        """Esquece referências de arquivos que sumiram ou mudaram e apaga objetos sem referência;
+        retorna bytes liberados"""
+        with self._lock:
+            self.refs = {path: entry for path, entry in self.refs.items() if self._valid_ref(path)}
+            live = self._live_keys()
+            freed = 0
+            
+            objects_dir = os.path.join(self.root, "objects")
+            for dirpath, _, filenames in os.walk(objects_dir):
+                for name in filenames:
+                    algo = os.path.relpath(dirpath, objects_dir).split(os.sep)[0]
+                    key = f"{algo}:{name}"
+                    if key in live and self._valid_object(key):
+                        continue
+                    freed += self._drop_object(key)
+            
+            self.objects = {key: sig for key, sig in self.objects.items() if key in live}
+            self._prune_aliases(live)
+            self._save()
+        return freed
+
+    def _drop_object(self, key):
+        self.objects.pop(key, None)
+        obj = self._object_for(key)
+        try:
+            size = os.path.getsize(obj)
+            self._remove(obj)
+            return size
+        except OSError:
+            return 0
+
+    def _prune_aliases(self, live):
+        self.aliases = {alias: key for alias, key in self.aliases.items() if key in live}
+
+    def _replace_with_clone(self, src, dest_path):
+        tmp_path = dest_path + ".store-tmp"
+        self._remove(tmp_path)
+        self._clone(src, tmp_path)
+        self._make_writable(tmp_path)
+        os.replace(tmp_path, dest_path)
+
+    def _replace_with_reflink(self, src, dest_path):
+        tmp_path = dest_path + ".store-tmp"
+        self._remove(tmp_path)
+        if self._reflink(src, tmp_path):
+            self._make_writable(tmp_path)
+            os.replace(tmp_path, dest_path)
+
+    @staticmethod
+    def _clone(src, dest):
+        """reflink (cópia sob demanda) quando o sistema de arquivos permite; senão cópia comum"""
+        if not ContentStore._reflink(src, dest):
+            shutil.copy2(src, dest)
+
+    @staticmethod
+    def _reflink(src, dest):
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            import fcntl
+            with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), ContentStore.FICLONE, fsrc.fileno())
+            shutil.copystat(src, dest)
+            return True
+        except OSError:
+            ContentStore._remove(dest)
+            return False
+
+    @staticmethod
+    def _make_writable(path):
+        # O clone herda o modo somente leitura do objeto; a instalação precisa poder ser alterada
+        os.chmod(path, stat.S_IMODE(os.stat(path).st_mode) | stat.S_IWUSR)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            # No Windows, arquivos somente leitura não podem ser apagados
+            os.chmod(path, stat.S_IWRITE)
+            os.remove(path)
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"refs": self.refs, "objects": self.objects, "aliases": self.aliases}, f)
+        os.replace(tmp_path, self.index_path)
+
+# ====================== ÍNDICE DE INSTALAÇÕES ======================
+InstallRecord = namedtuple("InstallRecord", "install_key path size mtime_ns algo digest verified_at")
+
+class InstallIndex:
+    """Estado de instalação persistido em SQLite, chaveado por GameManager.install_key;
+    a interface consulta só a cópia em memória"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS installs (
+            install_key TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            size INTEGER,
+            mtime_ns INTEGER,
+            algo TEXT,
+            digest TEXT,
+            verified_at REAL
+        )"""
+
+    def __init__(self, path=None, on_change=None):
+        self.path = path or os.path.join(Config.DOWNLOADS_DIR, Config.INSTALL_INDEX_FILE)
+        self.on_change = on_change  # on_change(chave, instalado) quando uma chave entra ou sai do índice
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(self.SCHEMA)
+        self.records = {row[0]: InstallRecord(*row) for row in self._db.execute("SELECT * FROM installs")}
+
+    def is_installed(self, key):
+        return key in self.records
+
+    def get(self, key):
+        return self.records.get(key)
+
+    def mark_installed(self, key, path, algo=None, digest=None):
+        st = os.stat(path)
+        record = InstallRecord(key, os.path.abspath(path), st.st_size, st.st_mtime_ns,
+                               algo, digest, time.time() if digest else None)
+        with self._lock:
+            self._put(record)
+            self._db.commit()
+
+    def mark_removed(self, key):
+        with self._lock:
+            self._delete(key)
+            self._db.commit()
+
+    def scan(self, paths, integrity=None):
+        """Reconcilia o índice com o disco numa única passada de os.scandir em downloads/.
+        
+        paths mapeia a chave de instalação (GameManager.install_key) -> caminho esperado do
+        executável; retorna as chaves que mudaram.
+        """
+        try:
+            with os.scandir(Config.DOWNLOADS_DIR) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            entries = {}
+        
+        found = {}
+        for key, path in paths.items():
+            relative = os.path.relpath(path, Config.DOWNLOADS_DIR)
+            top = relative.split(os.sep)[0]
+            if top not in entries:
+                continue
+            try:
+                # Executáveis soltos usam o stat do próprio scandir; só pacotes descem no diretório
+                st = entries[top].stat() if top == relative else os.stat(path)
+            except OSError:
+                continue
+            found[key] = (os.path.abspath(path), st)
+        
+        changed = set()
+        with self._lock:
+            for key in set(self.records) - set(found):
+                self._delete(key)
+                changed.add(key)
+            
+            for key, (path, st) in found.items():
+                record = self.records.get(key)
+                entry = integrity.entry(path) if integrity else None
+                if entry and entry["signature"][:2] != [st.st_size, st.st_mtime_ns]:
+                    entry = None
+                
+                if (record and record.path == path and record.size == st.st_size
+                        and record.mtime_ns == st.st_mtime_ns
+                        and (not entry or entry["verified_at"] == record.verified_at)):
+                    continue
+                
+                if entry:
+                    algo, digest, verified_at = entry["algo"], entry["digest"], entry["verified_at"]
+                else:
+                    algo = digest = verified_at = None
+                self._put(InstallRecord(key, path, st.st_size, st.st_mtime_ns, algo, digest, verified_at))
+                if not record:
+                    changed.add(key)
+            self._db.commit()
+        return changed
+
+    def _put(self, record):
+        self._db.execute("INSERT OR REPLACE INTO installs VALUES (?, ?, ?, ?, ?, ?, ?)", record)
+        added = record.install_key not in self.records
+        self.records[record.install_key] = record
+        if added and self.on_change:
+            self.on_change(record.install_key, True)
+
+    def _delete(self, key):
+        self._db.execute("DELETE FROM installs WHERE install_key = ?", (key,))
+        if self.records.pop(key, None) is not None and self.on_change:
+            self.on_change(key, False)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+# ====================== GERENCIADOR DE ÁUDIO ======================
+class AudioManager:
+    def __init__(self, background=False, on_ready=None, startup=None):
+        self.sounds = {}
+        self.on_ready = on_ready
+        self.startup = startup or StartupTimer()
+        if background:
+            threading.Thread(target=self._load, daemon=True).start()
+        else:
+            self._load()
+
+    def _load(self):
+        with self.startup.phase("audio"):
+            self.setup_audio()
+        if self.on_ready:
+            self.on_ready(self)
+
+    def setup_audio(self):
+        try:
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
+            
+            for name, path in Config.SOUNDS.items():
+                full_path = os.path.join(Config.ASSETS_DIR, path)
+                if os.path.exists(full_path):
+                    self.sounds[name] = pygame.mixer.Sound(full_path)
+                    self.sounds[name].set_volume(0.7)
+                else:
+                    self._create_fallback_sound(name)
+        except Exception as e:
+            print(f"Erro ao inicializar áudio: {e}")
+            self._create_all_fallback_sounds()
+
+    def _create_fallback_sound(self, name):
+        samples = []
+        duration = 0.3
+        
+        if name == "startup": freq = 523.25
+        elif name == "confirm": freq = 783.99
+        elif name == "back": freq = 392.00
+        else: freq = 659.25
+            
+        for i in range(int(22050 * duration)):
+            value = int(32767 * 0.3 * math.sin(2 * math.pi * freq * i / 22050))
+            samples.append(value)
+        
+        self.sounds[name] = pygame.mixer.Sound(buffer=bytearray(samples))
+
+    def _create_all_fallback_sounds(self):
+        for name in Config.SOUNDS.keys():
+            self._create_fallback_sound(name)
+
+    def play(self, sound_name):
+        if sound_name in self.sounds:
+            try:
+                self.sounds[sound_name].play()
+            except:
+                pass
+
+# ====================== CATÁLOGO ======================
+class GameCatalog:
+    """Lista de jogos com índice por chave de instalação e índice de prefixos para busca"""
+    PREFIX_INDEX_LENGTH = 3
+    SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+    def __init__(self, games=()):
+        self._installed_keys = set()
+        self.clear()
+        self.extend(games)
+
+    def clear(self):
+        self.games = []
+        self.installed = set()  # índices dos jogos instalados, para o filtro não consultar jogo a jogo
+        self.by_key = {}
+        self.sizes = []
+        self._prefixes = {}
+        self._token_postings = {}
+        self._sorted_tokens = None
+
+    def __len__(self):
+        return len(self.games)
+
+    def __iter__(self):
+        return iter(self.games)
+
+    def __getitem__(self, index):
+        return self.games[index]
+
+    def extend(self, games):
+        for game in games:
+            if self._index(game):
+                # A lista ordenada é refeita só na próxima busca por prefixo longo
+                self._sorted_tokens = None
+
+    def add(self, game):
+        self.extend([game])
+
+    def _index(self, game):
+        index = len(self.games)
+        self.games.append(game)
+        # exe_name não é único: pacotes diferentes podem trazer o mesmo game.exe
+        key = GameManager.install_key(game)
+        self.by_key[key] = index
+        if key in self._installed_keys:
+            self.installed.add(index)
+        self.sizes.append(self.parse_size(game.get("size", "")))
+        
+        new_tokens = False
+        for token in self.tokenize(f"{game['title']} {game['exe_name']} {game.get('id', '')}"):
+            postings = self._token_postings.get(token)
+            if postings is None:
+                postings = self._token_postings[token] = set()
+                new_tokens = True
+            postings.add(index)
+            # Prefixos curtos ficam pré-calculados: são os mais comuns ao digitar e os mais caros de unir
+            for n in range(1, min(len(token), self.PREFIX_INDEX_LENGTH) + 1):
+                self._prefixes.setdefault(token[:n], set()).add(index)
+        return new_tokens
+
+    def set_installed_keys(self, keys):
+        """Substitui o conjunto de chaves de instalação presentes no disco"""
+        self._installed_keys = set(keys)
+        self.installed = {self.by_key[key] for key in self._installed_keys if key in self.by_key}
+
+    def mark_installed(self, key, installed):
+        """Pode ser chamado de qualquer thread: as operações em set são atômicas sob o GIL"""
+        if installed:
+            self._installed_keys.add(key)
+        else:
+            self._installed_keys.discard(key)
+        # by_key é preenchido antes de _index consultar _installed_keys, então nenhum dos lados perde a mudança
+        index = self.by_key.get(key)
+        if index is not None:
+            if installed:
+                self.installed.add(index)
+            else:
+                self.installed.discard(index)
+
+    def find_by_key(self, key):
+        index = self.by_key.get(key)
+        return None if index is None else self.games[index]
+
+    def search(self, query="", installed=None, min_size=None, max_size=None):
+        """Índices dos jogos cujos tokens começam com todos os termos da busca e que passam nos filtros"""
+        candidates = None
+        # Termos mais longos costumam ser mais seletivos; começar por eles reduz as interseções
+        for term in sorted(self.tokenize(query), key=len, reverse=True):
+            matches = self._match_prefix(term)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        
+        if installed is not None:
+            if installed:
+                candidates = set(self.installed) if candidates is None else candidates & self.installed
+            elif candidates is not None:
+                candidates = candidates - self.installed
+        
+        if candidates is not None:
+            results = sorted(candidates)
+        elif installed is False:
+            results = self._complement(self.installed)
+        else:
+            results = range(len(self.games))
+        
+        if min_size is not None or max_size is not None:
+            low = 0 if min_size is None else min_size
+            high = float("inf") if max_size is None else max_size
+            results = [i for i in results if low <= self.sizes[i] <= high]
+        
+        return list(results)
+
+    def _complement(self, excluded):
+        """Índices fora de excluded, em ordem, montados por faixas em vez de testar um a um"""
+        results = []
+        start = 0
+        for index in sorted(excluded):
+            results.extend(range(start, index))
+            start = index + 1
+        results.extend(range(start, len(self.games)))
+        return results
+
+    def _match_prefix(self, term):
+        if len(term) <= self.PREFIX_INDEX_LENGTH:
+            return self._prefixes.get(term, set())
+        
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._token_postings)
+        
+        matches = set()
+        start = bisect.bisect_left(self._sorted_tokens, term)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(term):
+                break
+            matches |= self._token_postings[token]
+        return matches
+
+    @staticmethod
+    def tokenize(text):
+        text = unicodedata.normalize("NFKD", str(text).lower())
+        text = "".join(c for c in text if not unicodedata.combining(c))
+        return re.findall(r"[a-z0-9]+", text)
+
+    @staticmethod
+    def parse_size(size):
+        """Converte textos como "10 MB" ou "1,5 GB" em bytes (0 se não reconhecer)"""
+        match = re.match(r"\s*(\d+(?:[.,]\d+)?)\s*([KMGT]?)I?B", str(size).upper())
+        if not match:
+            return 0
+        value = float(match.group(1).replace(",", "."))
+        return int(value * GameCatalog.SIZE_UNITS[match.group(2) + "B" if match.group(2) else "B"])
+
+# ====================== SINCRONIZAÇÃO DO CATÁLOGO ======================
+def iter_json_array(chunks):
+    """Gera os elementos de um array JSON à medida que os pedaços de texto chegam"""
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    started = False
+    chunks = iter(chunks)
+    exhausted = False
+    
+    while True:
+        # Pula espaços e separadores até o próximo valor
+        while pos < len(buf) and (buf[pos].isspace() or (started and buf[pos] == ",")):
+            pos += 1
+        
+        if pos < len(buf):
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("O catálogo deve ser um array JSON")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # Um número no fim do buffer pode estar incompleto
+                if end < len(buf) or exhausted:
+                    yield value
+                    pos = end
+                    continue
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+        elif exhausted:
+            raise ValueError("Catálogo JSON truncado")
+        
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            exhausted = True
+            continue
+        
+        # Descarta o que já foi consumido para o buffer não crescer sem limite
+        buf = buf[pos:] + chunk
+        pos = 0
+
+class CatalogSync:
+    """Catálogo remoto com requisição condicional (ETag/If-Modified-Since) e cópia local em disco"""
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, url=None, cache_path=None, meta_path=None):
+        self.url = Config.CATALOG_URL if url is None else url
+        self.cache_path = cache_path or Config.CATALOG_FILE
+        self.meta_path = meta_path or Config.CATALOG_META_FILE
+
+    def iter_batches(self, batch_size=None):
+        """Gera (reiniciar, lote): primeiro o cache local, depois o servidor se o catálogo mudou"""
+        batch_size = batch_size or Config.CATALOG_BATCH_SIZE
+        had_cache = False
+        
+        if os.path.exists(self.cache_path):
+            try:
+                for batch in self._batched(self._iter_cache(), batch_size):
+                    yield not had_cache, batch
+                    had_cache = True
+            except (OSError, ValueError) as e:
+                print(f"Erro ao ler o catálogo local: {e}", file=sys.stderr)
+        
+        if not self.url:
+            return
+        
+        try:
+            entries = self._fetch()
+            if entries is None:
+                return
+            if had_cache:
+                # Já há um catálogo na tela: só troca quando o novo estiver completo
+                entries = list(entries)
+            for i, batch in enumerate(self._batched(entries, batch_size)):
+                yield i == 0, batch
+        except Exception as e:
+            # Sem rede: segue com o que veio do cache
+            print(f"Erro ao sincronizar o catálogo: {e}", file=sys.stderr)
+
+    def _iter_cache(self):
+        with open(self.cache_path, "r", encoding="utf-8") as f:
+            yield from iter_json_array(iter(lambda: f.read(self.CHUNK_SIZE), ""))
+
+    def _fetch(self):
+        """Gera as entradas do catálogo remoto; None se o servidor respondeu 304"""
+        meta = self._load_meta()
+        headers = {}
+        if os.path.exists(self.cache_path):
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        
+        r = HttpClient.get(self.url, headers=headers, stream=True)
+        if r.status_code == 304:
+            r.close()
+            return None
+        r.raise_for_status()
+        return self._stream_to_cache(r)
+
+    def _stream_to_cache(self, r):
+        """Interpreta a resposta enquanto grava a cópia local; só substitui o cache se tudo der certo"""
+        tmp_path = self.cache_path + ".tmp"
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        
+        try:
+            with r, open(tmp_path, "wb") as f:
+                def text_chunks():
+                    for chunk in r.iter_content(chunk_size=self.CHUNK_SIZE):
+                        f.write(chunk)
+                        yield decoder.decode(chunk)
+                    yield decoder.decode(b"", final=True)
+                
+                yield from iter_json_array(text_chunks())
+                # Consome o restante (espaços após o "]") para a cópia ficar completa
+                for chunk in r.iter_content(chunk_size=self.CHUNK_SIZE):
+                    f.write(chunk)
+            
+            os.replace(tmp_path, self.cache_path)
+            self._save_meta({
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified")
+            })
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, "r") as f:
+                return json.load(f)
+        except:
+            return {}
+
+    def _save_meta(self, meta):
+        with open(self.meta_path, "w") as f:
+            json.dump(meta, f)
+
+    @staticmethod
+    def _batched(iterable, size):
+        batch = []
+        for item in iterable:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+# ====================== GERENCIADOR DE JOGOS ======================
+class GameManager:
+    DEFAULT_GAMES = [
+        {
+            "title": "Jogo de Teste",
+            "image": "games/test_game.jpg",
+            "size": "10 MB",
+            "exe_name": "ChromeSetup.exe",
+            "download_url": "https://drive.usercontent.google.com/download?id=1sbAijvGUPPnt5nG2kv_6Cp0DSCCZGtNV&export=download&authuser=0",
+            "md5": "d41d8cd98f00b204e9800998ecf8427e"
+        }
+    ]
+
+    def __init__(self):
+        self.catalog = GameCatalog()
+        self.catalog_sync = CatalogSync()
+        self.create_directories()
+        self.integrity = IntegrityCache()
+        self.store = ContentStore()
+        self.installs = InstallIndex(on_change=self.catalog.mark_installed)
+        self.catalog.set_installed_keys(self.installs.records)
+        threading.Thread(target=self.store.gc, daemon=True).start()
+
+    def load_games(self):
+        """Carrega o catálogo inteiro na thread atual"""
+        for reset, batch in self.catalog_sync.iter_batches():
+            self._apply_batch(reset, batch)
+        self._ensure_games()
+
+    def load_games_async(self, dispatch, on_change=None, on_loaded=None):
+        """Carrega o catálogo em segundo plano, em lotes.
+        
+        dispatch(func, *args) deve executar func na thread dona do catálogo
+        (no launcher, root.after); on_change é chamado após cada lote.
+        """
+        def apply(reset, batch):
+            self._apply_batch(reset, batch)
+            if on_change:
+                on_change()
+        
+        def finish():
+            if self._ensure_games() and on_change:
+                on_change()
+            if on_loaded:
+                on_loaded()
+        
+        def worker():
+            for reset, batch in self.catalog_sync.iter_batches():
+                dispatch(apply, reset, batch)
+            dispatch(finish)
+        
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _apply_batch(self, reset, batch):
+        if reset:
+            self.catalog.clear()
+        self.catalog.extend(batch)
+
+    def _ensure_games(self):
+        """Usa o jogo de exemplo quando não há catálogo local nem remoto"""
+        if len(self.catalog) == 0:
+            self.catalog.extend(self.DEFAULT_GAMES)
+            return True
+        return False
+
+    @property
+    def games(self):
+        return self.catalog.games
+
+    def search(self, query="", installed=None, min_size=None, max_size=None):
+        indices = self.catalog.search(query, installed=installed, min_size=min_size, max_size=max_size)
+        return [self.catalog[i] for i in indices]
+
+    def create_directories(self):
+        os.makedirs(Config.DOWNLOADS_DIR, exist_ok=True)
+        os.makedirs(os.path.join(Config.ASSETS_DIR, "audio"), exist_ok=True)
+        os.makedirs(os.path.join(Config.ASSETS_DIR, "games"), exist_ok=True)
+
+    @staticmethod
+    def archive_type(game):
+        """"zip" ou "tar" para jogos distribuídos como pacote; None para um único executável"""
+        kind = game.get("archive")
+        if kind:
+            return "zip" if kind.lower() == "zip" else "tar"
+        
+        path = urlsplit(game.get("download_url", "")).path.lower()
+        if path.endswith(".zip"):
+            return "zip"
+        if path.endswith((".tar", ".tar.gz", ".tgz", ".tar.xz", ".txz", ".tar.bz2")):
+            return "tar"
+        return None
+
+    @staticmethod
+    def install_key(game):
+        """Identifica a instalação do jogo: caminho do executável relativo a downloads/.
+        
+        Igual ao exe_name para executáveis soltos; em pacotes inclui o diretório do jogo.
+        """
+        if GameManager.archive_type(game):
+            return f"{GameManager._install_name(game)}/{game['exe_name']}"
+        return game["exe_name"]
+
+    @staticmethod
+    def install_dir(game):
+        """Diretório próprio do jogo, usado pelos jogos distribuídos como pacote"""
+        return os.path.join(Config.DOWNLOADS_DIR, GameManager._install_name(game))
+
+    @staticmethod
+    def _install_name(game):
+        return str(game.get("id") or "-".join(GameCatalog.tokenize(game["title"])) or "jogo")
+
+    @staticmethod
+    def exe_path(game):
+        """Caminho do executável; em pacotes, exe_name é relativo ao diretório do jogo"""
+        if GameManager.archive_type(game):
+            return os.path.join(GameManager.install_dir(game), game["exe_name"])
+        return os.path.join(Config.DOWNLOADS_DIR, game["exe_name"])
+
+    def _exe_path_for(self, key):
+        game = self.catalog.find_by_key(key)
+        return self.exe_path(game) if game else os.path.join(Config.DOWNLOADS_DIR, key)
+
+    def is_game_installed(self, game):
+        return self.installs.is_installed(self.install_key(game))
+
+    def install_paths(self, games=None):
+        """Mapeia a chave de instalação de cada jogo para o caminho esperado do executável"""
+        return {self.install_key(game): self.exe_path(game) for game in (self.games if games is None else games)}
+
+    def refresh_installs(self, callback=None):
+        """Confere o índice de instalações com o disco em segundo plano;
+        callback recebe as chaves dos jogos que passaram a estar (ou deixaram de estar) instalados"""
+        def worker():
+            paths = self.install_paths(list(self.games))
+            changed = self.installs.scan(paths, self.integrity)
+            if changed and callback:
+                callback(changed)
+        
+        threading.Thread(target=worker, daemon=True).start()
+
+    def verify_game_integrity(self, key, expected_digest, algo="md5"):
+        exe_path = self._exe_path_for(key)
+        if not os.path.exists(exe_path):
+            return False
+        
+        # Só recalcula se tamanho, mtime ou inode mudaram desde a última verificação
+        digest = self.integrity.lookup(exe_path, algo)
+        if digest is None:
+            digest = HashEngine.hash_file(exe_path, algo)
+            self.integrity.record(exe_path, algo, digest)
+        return digest == expected_digest.lower()
+
+    def verify_game(self, game, force=False):
+        """Confere o executável: contra o catálogo se for um arquivo único, ou contra o digest
+        registrado na instalação se veio de um pacote (o digest do catálogo é o do pacote)"""
+        exe_path = self.exe_path(game)
+        if not os.path.exists(exe_path):
+            return False
+        
+        if self.archive_type(game):
+            return self.integrity.verify_recorded(exe_path, force=force)
+        
+        expected = HashEngine.expected_digest(game)
+        if not expected:
+            return True
+        algo, expected_digest = expected
+        if force:
+            self.integrity.invalidate(exe_path)
+        return self.verify_game_integrity(self.install_key(game), expected_digest, algo)
+
+    def verification_target(self, game):
+        """(caminho, algoritmo, digest esperado) de um jogo instalado, ou None se não há com o que comparar"""
+        exe_path = self.exe_path(game)
+        if self.archive_type(game):
+            # O digest do catálogo é o do pacote; o do executável ficou registrado na instalação
+            entry = self.integrity.entry(exe_path)
+            record = self.installs.get(self.install_key(game))
+            if entry:
+                return exe_path, entry["algo"], entry["digest"]
+            if record and record.digest:
+                return exe_path, record.algo, record.digest
+            return None
+        expected = HashEngine.expected_digest(game)
+        if not expected:
+            return None
+        return exe_path, expected[0], expected[1].lower()
+
+    def uninstall_game(self, game):
+        """Remove os arquivos do jogo e libera os objetos do armazenamento que só ele usava"""
+        exe_path = self.exe_path(game)
+        if self.archive_type(game):
+            install_dir = self.install_dir(game)
+            self.store.release_tree(install_dir)
+            shutil.rmtree(install_dir, ignore_errors=True)
+        else:
+            self.store.release(exe_path)
+            if os.path.exists(exe_path):
+                os.remove(exe_path)
+        self.integrity.invalidate(exe_path)
+        self.installs.mark_removed(self.install_key(game))
+
+    def reverify_all(self, callback=None):
+        """Recalcula em segundo plano o hash de todos os jogos instalados"""
+        def worker():
+            results = {}
+            with self.integrity.batch():
+                for game in list(self.games):
+                    if not self.is_game_installed(game):
+                        continue
+                    try:
+                        results[game["title"]] = self.verify_game(game, force=True)
+                    except Exception:
+                        results[game["title"]] = False
+            if callback:
+                callback(results)
+        
+        threading.Thread(target=worker, daemon=True).start()
+
+# ====================== MOTOR DE DOWNLOAD ======================
+class DownloadCancelled(Exception):
+    pass
+
+class IntegrityError(Exception):
+    pass
+
+class MirrorSource:
+    """Uma origem do download, com as medições usadas para escolher de onde puxar cada segmento"""
+    RATE_SMOOTHING = 0.5
+
+    def __init__(self, url):
+        self.url = url
+        self.latency = None
+        self.rate = 0.0
+        self.active = 0
+        self.failures = 0
+        self.dead = False
+        self.accepts_ranges = False
+        self.total_size = 0
+        self.validator = None
+        self.error = None
+
+    def record(self, received, seconds):
+        """Atualiza a vazão medida (média móvel) com uma transferência concluída ou interrompida"""
+        if received <= 0 or seconds <= 0:
+            return
+        sample = received / seconds
+        self.rate = sample if not self.rate else self.rate + self.RATE_SMOOTHING * (sample - self.rate)
+
+    def score(self):
+        """Vazão esperada para mais uma conexão, dividindo a medida entre as que já estão ativas"""
+        return (self.rate or 1.0) / (self.active + 1)
+
+class ChunkSizer:
+    """Ajusta o tamanho de cada leitura à vazão medida, mirando TARGET_SECONDS por bloco"""
+    TARGET_SECONDS = 0.05
+
+    def __init__(self, throttle=None):
+        self.size = Config.DOWNLOAD_CHUNK_SIZE
+        self.throttle = throttle
+
+    def next_size(self, remaining=None):
+        size = self.size
+        if self.throttle and self.throttle.rate:
+            # Com limite de banda, blocos grandes só gerariam rajadas seguidas de pausas longas
+            size = min(size, max(Config.DOWNLOAD_MIN_CHUNK_SIZE, int(self.throttle.rate * self.TARGET_SECONDS)))
+        return size if remaining is None else min(size, remaining)
+
+    def record(self, requested, received, seconds):
+        if received < requested:
+            # Leitura curta (fim do corpo): não diz nada sobre a vazão
+            return
+        if seconds < self.TARGET_SECONDS / 2:
+            self.size = min(self.size * 2, Config.DOWNLOAD_MAX_CHUNK_SIZE)
+        elif seconds > self.TARGET_SECONDS * 2:
+            self.size = max(self.size // 2, Config.DOWNLOAD_MIN_CHUNK_SIZE)
+
+class Downloader:
+    """Baixa um arquivo em segmentos paralelos (HTTP Range), com retomada.
+    
+    Com espelhos, cada segmento é puxado do espelho mais rápido no momento e,
+    se ele travar ou falhar, continua de onde parou em outro.
+    """
+    PROGRESS_INTERVAL = 1.0 / Config.FPS
+    STATE_INTERVAL = 1.0
+
+    def __init__(self, url, dest_path, segments=None, on_progress=None, should_continue=None, throttle=None,
+                 hash_algo="md5", expected_digest=None, mirrors=None, store_algo=None):
+        self.url = url
+        self.sources = [MirrorSource(url)] + [MirrorSource(m) for m in (mirrors or []) if m != url]
+        self._primary = self.sources[0]
+        self.dest_path = dest_path
+        self.part_path = dest_path + ".part"
+        self.state_path = dest_path + ".part.json"
+        self.segments = max(1, segments or Config.DOWNLOAD_SEGMENTS)
+        self.on_progress = on_progress
+        self.should_continue = should_continue or (lambda: True)
+        self.throttle = throttle
+        self.hash_algo = hash_algo
+        self.expected_digest = expected_digest
+        self.digest = None
+        # Digest do armazenamento deduplicado, calculado na mesma passada que o de verificação
+        self.store_algo = store_algo
+        self.store_digest = None
+        
+        self.total_size = 0
+        self.downloaded = 0
+        self.ranges = []
+        self.validator = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._hasher = MultiHasher(hash_algo, store_algo)
+        self._hash_pos = 0
+        self._catch_up_lock = threading.Lock()
+        self._last_progress = 0
+        self._last_state = 0
+
+    def run(self):
+        """Executa o download; levanta DownloadCancelled se interrompido"""
+        accepts_ranges = self._probe() if len(self.sources) == 1 else self._probe_mirrors()
+        
+        if accepts_ranges and self.total_size > 0:
+            self._download_ranges()
+        else:
+            self._download_single()
+        
+        if self.total_size and self.downloaded != self.total_size:
+            raise IOError("Download incompleto ou arquivo corrompido")
+        
+        self._catch_up_hash()
+        self.digest = self._hasher.hexdigest(self.hash_algo)
+        if self.store_algo:
+            self.store_digest = self._hasher.hexdigest(self.store_algo)
+        if self.expected_digest and self.digest != self.expected_digest.lower():
+            os.remove(self.part_path)
+            self._remove_state()
+            raise IntegrityError("Checksum do arquivo baixado não confere")
+        
+        # Só vira "instalado" depois que o conteúdo está no disco e o rename é atômico
+        with open(self.part_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(self.part_path, self.dest_path)
+        Downloader._fsync_dir(os.path.dirname(os.path.abspath(self.dest_path)))
+        self._remove_state()
+        return self.dest_path
+
+    @staticmethod
+    def _fsync_dir(path):
+        """Persiste o rename no diretório (não se aplica no Windows)"""
+        if os.name != "posix":
+            return
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _preallocate(f, size):
+        """Reserva o espaço do arquivo de uma vez; cai para truncate onde não há posix_fallocate"""
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+                return
+            except OSError:
+                # Sistema de arquivos sem suporte (ex.: alguns montados por rede)
+                pass
+        f.truncate(size)
+
+    @staticmethod
+    def _body_reader(r):
+        """readinto(buffer) para o corpo da resposta.
+        
+        Sem Content-Encoding, lê direto da resposta do http.client, que copia do
+        socket para o buffer sem criar um bytes por bloco.
+        """
+        fp = getattr(r.raw, "_fp", None)
+        encoding = r.headers.get("Content-Encoding", "identity").lower()
+        if encoding == "identity" and hasattr(fp, "readinto"):
+            return fp.readinto
+        
+        def readinto(view):
+            data = r.raw.read(len(view), decode_content=True)
+            view[:len(data)] = data
+            return len(data)
+        return readinto
+
+    def _stream_body(self, r, f, rng=None, limit=None):
+        """Copia o corpo da resposta para f usando um único buffer; retorna False se interrompido"""
+        readinto = self._body_reader(r)
+        buf = bytearray(Config.DOWNLOAD_MAX_CHUNK_SIZE)
+        view = memoryview(buf)
+        sizer = ChunkSizer(self.throttle)
+        offset = rng["pos"] if rng is not None else self.downloaded
+        
+        while limit is None or limit > 0:
+            if self._stop.is_set():
+                return False
+            if not self.should_continue():
+                self._stop.set()
+                return False
+            
+            size = sizer.next_size(limit)
+            started = time.perf_counter()
+            n = readinto(view[:size])
+            if not n:
+                break
+            sizer.record(size, n, time.perf_counter() - started)
+            
+            chunk = view[:n]
+            if self.throttle:
+                self.throttle.consume(n)
+            
+            # Arquivo sem buffer: write pode gravar menos que o pedido
+            pending = chunk
+            with DOWNLOAD_WRITE_SECONDS.timer():
+                while pending:
+                    written = f.write(pending)
+                    pending = pending[written:]
+            DOWNLOAD_BYTES.inc(n)
+            
+            self._advance(rng, chunk, offset)
+            offset += n
+            if limit is not None:
+                limit -= n
+        
+        # Deixa o urllib3 perceber o fim do corpo e devolver a conexão ao pool
+        r.raw.read()
+        return True
+
+    def _probe(self):
+        """Descobre o tamanho total e se o servidor aceita intervalos"""
+        with HttpClient.get(self.url, headers={"Range": "bytes=0-0"}, stream=True) as r:
+            r.raise_for_status()
+            # Usa a URL final para não repetir redirecionamentos em cada segmento
+            self.url = r.url
+            self.validator = r.headers.get("ETag") or r.headers.get("Last-Modified")
+            
+            content_range = r.headers.get("Content-Range", "")
+            if r.status_code == 206 and "/" in content_range:
+                # Consome o byte pedido para a conexão voltar ao pool
+                r.raw.read()
+                total = content_range.rsplit("/", 1)[1]
+                if total.isdigit():
+                    self.total_size = int(total)
+                    return True
+            
+            self.total_size = int(r.headers.get("content-length", 0))
+            return False
+
+    def _probe_mirrors(self):
+        """Sonda todos os espelhos em paralelo e os ordena pela vazão medida na amostra"""
+        threads = [threading.Thread(target=self._probe_source, args=(source,), daemon=True)
+                   for source in self.sources]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        alive = sorted((s for s in self.sources if not s.dead), key=lambda s: s.rate, reverse=True)
+        if not alive:
+            raise self.sources[0].error
+        
+        # Só espelhos com o mesmo arquivo (mesmo tamanho) do melhor podem ser misturados
+        ranged = [s for s in alive if s.accepts_ranges]
+        best = ranged[0] if ranged else alive[0]
+        self.sources = [s for s in (ranged or alive) if s.total_size == best.total_size]
+        self.url = best.url
+        self.total_size = best.total_size
+        
+        # Cada servidor tem seu ETag; a retomada segue o do endereço principal do catálogo
+        primary = next((s for s in self.sources if s is self._primary), None)
+        self.validator = primary.validator if primary else None
+        return bool(ranged) and self.total_size > 0
+
+    def _probe_source(self, source):
+        headers = {"Range": f"bytes=0-{Config.MIRROR_PROBE_BYTES - 1}"}
+        begin = time.perf_counter()
+        try:
+            with HttpClient.get(source.url, headers=headers, stream=True,
+                                timeout=(Config.HTTP_CONNECT_TIMEOUT, Config.MIRROR_STALL_TIMEOUT)) as r:
+                r.raise_for_status()
+                source.latency = time.perf_counter() - begin
+                source.url = r.url
+                source.validator = r.headers.get("ETag") or r.headers.get("Last-Modified")
+                
+                content_range = r.headers.get("Content-Range", "")
+                total = content_range.rsplit("/", 1)[-1]
+                if r.status_code == 206 and total.isdigit():
+                    source.accepts_ranges = True
+                    source.total_size = int(total)
+                    received = len(r.raw.read())
+                    source.record(received, time.perf_counter() - begin)
+                else:
+                    # Sem Range não dá para medir sem baixar tudo: fica só a latência
+                    source.total_size = int(r.headers.get("content-length", 0))
+                    source.rate = 1.0 / source.latency
+        except Exception as e:
+            source.dead = True
+            source.error = e
+
+    def _pick_source(self):
+        """Espelho vivo com a maior vazão esperada para uma nova conexão"""
+        with self._lock:
+            alive = [s for s in self.sources if not s.dead]
+            if not alive:
+                return None
+            source = max(alive, key=MirrorSource.score)
+            source.active += 1
+            return source
+
+    def _source_failed(self, source, error):
+        with self._lock:
+            source.failures += 1
+            source.error = error
+            source.rate /= 2
+            others = any(s is not source and not s.dead for s in self.sources)
+            if others and source.failures >= Config.MIRROR_MAX_FAILURES:
+                source.dead = True
+            return others
+
+    def _download_single(self):
+        """Fallback para servidores sem suporte a Range: uma conexão, sem retomada; tenta os espelhos em ordem"""
+        for i, source in enumerate(self.sources):
+            try:
+                self._download_single_from(source.url)
+                return
+            except DownloadCancelled:
+                raise
+            except Exception:
+                if i == len(self.sources) - 1:
+                    raise
+
+    def _download_single_from(self, url):
+        self._remove_state()
+        self.downloaded = 0
+        self._hasher = MultiHasher(self.hash_algo, self.store_algo)
+        self._hash_pos = 0
+        
+        with HttpClient.get(url, stream=True) as r:
+            r.raise_for_status()
+            self.total_size = int(r.headers.get("content-length", 0))
+            
+            with open(self.part_path, "wb", buffering=0) as f:
+                if self.total_size:
+                    Downloader._preallocate(f, self.total_size)
+                if not self._stream_body(r, f):
+                    raise DownloadCancelled()
+        
+        self._notify_progress(force=True)
+
+    def _download_ranges(self):
+        if not self._load_state():
+            self._plan_ranges()
+            
+            # Pré-aloca o arquivo para que cada segmento escreva no seu offset
+            with open(self.part_path, "wb") as f:
+                Downloader._preallocate(f, self.total_size)
+            self._save_state()
+        
+        self.downloaded = sum(rng["pos"] - rng["start"] for rng in self.ranges)
+        self._notify_progress(force=True)
+        
+        # Cada conexão pega o próximo segmento pendente; com espelhos há mais segmentos
+        # que conexões, então os espelhos mais rápidos acabam baixando mais deles
+        errors = []
+        pending = deque(rng for rng in self.ranges if rng["pos"] <= rng["end"])
+        
+        def worker():
+            while not self._stop.is_set():
+                with self._lock:
+                    if not pending:
+                        return
+                    rng = pending.popleft()
+                self._fetch_range_safe(rng, errors)
+        
+        threads = []
+        for _ in range(min(self.segments, len(pending))):
+            t = threading.Thread(target=worker, daemon=True)
+            t.start()
+            threads.append(t)
+        
+        for t in threads:
+            t.join()
+        
+        self._save_state()
+        self._notify_progress(force=True)
+        
+        if errors:
+            raise errors[0]
+        if self._stop.is_set():
+            raise DownloadCancelled()
+
+    def _plan_ranges(self):
+        segments = self.segments * (Config.MIRROR_RANGES_PER_SEGMENT if len(self.sources) > 1 else 1)
+        count = min(segments, max(1, self.total_size // Config.MIN_SEGMENT_SIZE))
+        step = self.total_size // count
+        
+        self.ranges = []
+        for i in range(count):
+            start = i * step
+            end = self.total_size - 1 if i == count - 1 else start + step - 1
+            self.ranges.append({"start": start, "end": end, "pos": start})
+
+    def _fetch_range_safe(self, rng, errors):
+        attempts = Config.DOWNLOAD_RETRIES * len(self.sources)
+        for attempt in range(attempts):
+            source = self._pick_source()
+            if source is None:
+                errors.append(IOError("Nenhum espelho disponível"))
+                self._stop.set()
+                return
+            
+            started, start_pos = time.perf_counter(), rng["pos"]
+            try:
+                self._fetch_range(rng, source)
+                return
+            except Exception as e:
+                if self._stop.is_set():
+                    return
+                # O segmento continua de rng["pos"] no próximo espelho, sem recomeçar
+                others = self._source_failed(source, e)
+                if attempt == attempts - 1:
+                    errors.append(e)
+                    self._stop.set()
+                    return
+                if not others:
+                    time.sleep(2 ** min(attempt, 3))
+            finally:
+                with self._lock:
+                    source.active -= 1
+                source.record(rng["pos"] - start_pos, time.perf_counter() - started)
+
+    def _fetch_range(self, rng, source=None):
+        headers = {"Range": f"bytes={rng['pos']}-{rng['end']}"}
+        url = source.url if source else self.url
+        # Com outros espelhos disponíveis, um servidor parado perde o segmento mais cedo
+        read_timeout = Config.MIRROR_STALL_TIMEOUT if len(self.sources) > 1 else Config.HTTP_READ_TIMEOUT
+        with HttpClient.get(url, headers=headers, stream=True,
+                            timeout=(Config.HTTP_CONNECT_TIMEOUT, read_timeout)) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise IOError("O servidor ignorou o pedido de intervalo")
+            
+            # Sem buffer: o que o estado registra já foi entregue ao sistema operacional
+            with open(self.part_path, "r+b", buffering=0) as f:
+                f.seek(rng["pos"])
+                if not self._stream_body(r, f, rng, limit=rng["end"] - rng["pos"] + 1):
+                    return
+        
+        if rng["pos"] > rng["end"]:
+            # Segmento concluído: adianta o hash sobre o que os outros já escreveram
+            self._catch_up_hash()
+            return
+        
+        raise IOError("Conexão encerrada antes do fim do segmento")
+
+    def _advance(self, rng, chunk, offset):
+        count = len(chunk)
+        with self._lock:
+            # O hash é calculado em ordem: só o bloco que continua o cursor entra direto da memória
+            if offset == self._hash_pos:
+                self._hasher.update(chunk)
+                self._hash_pos += count
+            if rng is not None:
+                rng["pos"] += count
+            self.downloaded += count
+            
+            now = time.monotonic()
+            if rng is not None and now - self._last_state >= self.STATE_INTERVAL:
+                self._last_state = now
+                self._save_state()
+        
+        self._notify_progress()
+
+    def _notify_progress(self, force=False):
+        if not self.on_progress:
+            return
+        now = time.monotonic()
+        if force or now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.on_progress(self.downloaded, self.total_size)
+
+    def _hash_frontier(self):
+        """Fim da região contígua já gravada a partir do início do arquivo"""
+        for rng in self.ranges:
+            if rng["pos"] <= rng["end"]:
+                return rng["pos"]
+        return self.total_size if self.ranges else self._hash_pos
+
+    def _catch_up_hash(self):
+        """Lê do arquivo (ainda no cache do SO) os trechos que chegaram fora de ordem"""
+        with self._catch_up_lock:
+            while True:
+                with self._lock:
+                    start, end = self._hash_pos, self._hash_frontier()
+                if start >= end:
+                    return
+                
+                with open(self.part_path, "rb") as f:
+                    f.seek(start)
+                    remaining = end - start
+                    while remaining > 0:
+                        data = f.read(min(remaining, 1024 * 1024))
+                        if not data:
+                            raise IOError("Arquivo parcial menor que o esperado")
+                        self._hasher.update(data)
+                        remaining -= len(data)
+                
+                with self._lock:
+                    self._hash_pos = end
+
+    def _load_state(self):
+        """Recupera os segmentos pendentes de um download anterior"""
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            
+            if (state["total_size"] != self.total_size
+                    or state.get("validator") != self.validator
+                    or os.path.getsize(self.part_path) != self.total_size):
+                return False
+            
+            self.ranges = state["ranges"]
+            return True
+        except:
+            return False
+
+    def _save_state(self):
+        state = {
+            "url": self.url,
+            "total_size": self.total_size,
+            "validator": self.validator,
+            "ranges": self.ranges
+        }
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _remove_state(self):
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+# ====================== EVENTOS DE PROGRESSO ======================
+ProgressEvent = namedtuple("ProgressEvent", "key status downloaded total_size timestamp error")
+
+class ProgressSubscription:
+    """Fila própria de um consumidor do barramento"""
+    def __init__(self, bus, wakeup=None):
+        self.bus = bus
+        self.wakeup = wakeup
+        self._queue = queue.SimpleQueue()
+        self._pending = threading.Event()
+
+    def _put(self, event):
+        self._queue.put(event)
+        # Acorda o consumidor só na primeira publicação depois de ele esvaziar a fila
+        if self.wakeup and not self._pending.is_set():
+            self._pending.set()
+            self.wakeup()
+
+    def drain(self):
+        """Retorna o evento mais recente de cada download, na ordem em que chegaram"""
+        latest = self._collect()
+        if not latest:
+            # Fila vazia: volta a aceitar wakeups e confere de novo para não perder
+            # um evento publicado entre a leitura e a limpeza do sinal
+            self._pending.clear()
+            latest = self._collect()
+        return list(latest.values())
+
+    def _collect(self):
+        latest = {}
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                return latest
+            latest.pop(event.key, None)
+            latest[event.key] = event
+
+    def get(self, timeout=None):
+        """Bloqueia até o próximo evento (para consumidores com thread própria, como logs)"""
+        return self._queue.get(timeout=timeout)
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+class ProgressBus:
+    """Barramento de eventos de download: os workers publicam e cada assinante tem sua fila"""
+    def __init__(self):
+        self._subscriptions = ()
+        self._lock = threading.Lock()
+
+    def subscribe(self, wakeup=None):
+        subscription = ProgressSubscription(self, wakeup)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+
+    def publish(self, event):
+        # A tupla é substituída a cada assinatura, então a leitura aqui não precisa de lock
+        for subscription in self._subscriptions:
+            subscription._put(event)
+
+class TransferRate:
+    """Velocidade suavizada (média móvel exponencial) e tempo restante de uma transferência"""
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.rate = None
+        self._last = None
+
+    def update(self, downloaded, timestamp):
+        if self._last is not None:
+            last_bytes, last_time = self._last
+            elapsed = timestamp - last_time
+            if elapsed > 0 and downloaded >= last_bytes:
+                instant = (downloaded - last_bytes) / elapsed
+                self.rate = instant if self.rate is None else self.alpha * instant + (1 - self.alpha) * self.rate
+        self._last = (downloaded, timestamp)
+
+    def eta(self, remaining):
+        if not self.rate:
+            return None
+        return remaining / self.rate
+
+# ====================== INSTALAÇÃO DE PACOTES ======================
+class BoundedPipe:
+    """Buffer limitado entre a thread de rede e a de extração; quem está à frente espera o outro"""
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes or Config.INSTALL_PIPE_SIZE
+        self._chunks = deque()
+        self._size = 0
+        self._closed = False
+        self._error = None
+        self._cond = threading.Condition()
+
+    def write(self, data):
+        with self._cond:
+            while self._size >= self.max_bytes and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+            self._chunks.append(memoryview(data))
+            self._size += len(data)
+            self._cond.notify_all()
+
+    def close(self):
+        """Fim dos dados (EOF para o leitor)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def abort(self, error):
+        """Interrompe os dois lados; a exceção é levantada para quem estiver lendo ou escrevendo"""
+        with self._cond:
+            if self._error is None:
+                self._error = error
+            self._cond.notify_all()
+
+    def read(self, size=-1):
+        with self._cond:
+            while not self._chunks and not self._closed and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+            
+            wanted = self._size if size is None or size < 0 else size
+            parts = []
+            while self._chunks and wanted > 0:
+                chunk = self._chunks[0]
+                if len(chunk) <= wanted:
+                    parts.append(chunk)
+                    self._chunks.popleft()
+                else:
+                    parts.append(chunk[:wanted])
+                    self._chunks[0] = chunk[wanted:]
+                taken = len(parts[-1])
+                wanted -= taken
+                self._size -= taken
+            
+            self._cond.notify_all()
+            return b"".join(parts)
+
+    def read_exact(self, size):
+        parts = []
+        while size > 0:
+            data = self.read(size)
+            if not data:
+                raise EOFError("Pacote terminou antes do esperado")
+            parts.append(data)
+            size -= len(data)
+        return b"".join(parts)
+
+    def unread(self, data):
+        """Devolve bytes lidos a mais para o início do buffer"""
+        if data:
+            with self._cond:
+                self._chunks.appendleft(memoryview(data))
+                self._size += len(data)
+                self._cond.notify_all()
+
+class StreamingZipReader:
+    """Extrai um .zip lendo os cabeçalhos locais em sequência, sem precisar do diretório central"""
+    LOCAL_HEADER = 0x04034b50
+    DATA_DESCRIPTOR = 0x08074b50
+    CENTRAL_HEADERS = (0x02014b50, 0x06054b50, 0x06064b50)
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+
+    def entries(self):
+        """Gera (nome, é_diretório, iterador de blocos descomprimidos) para cada entrada"""
+        while True:
+            signature = struct.unpack("<I", self.pipe.read_exact(4))[0]
+            if signature in self.CENTRAL_HEADERS:
+                return
+            if signature != self.LOCAL_HEADER:
+                raise ValueError("Pacote zip inválido")
+            
+            (_, flags, method, _, _, crc, compressed_size, size,
+             name_len, extra_len) = struct.unpack("<HHHHHIIIHH", self.pipe.read_exact(26))
+            name = self.pipe.read_exact(name_len).decode("utf-8" if flags & 0x800 else "cp437")
+            extra = self.pipe.read_exact(extra_len)
+            
+            zip64 = compressed_size == 0xFFFFFFFF or size == 0xFFFFFFFF
+            if zip64:
+                size, compressed_size = self._zip64_sizes(extra, size, compressed_size)
+            has_descriptor = bool(flags & 0x08)
+            if flags & 0x01:
+                raise ValueError(f"Entrada criptografada não suportada: {name}")
+            if has_descriptor and method == 0:
+                raise ValueError(f"Entrada sem tamanho conhecido não suportada: {name}")
+            
+            data = self._iter_data(method, None if has_descriptor else compressed_size)
+            yield name, name.endswith("/"), data, crc
+            
+            # Garante que o conteúdo foi consumido mesmo se a entrada foi ignorada
+            for _ in data:
+                pass
+            if has_descriptor:
+                self._skip_descriptor(zip64)
+
+    def _iter_data(self, method, compressed_size):
+        if method == 0:
+            remaining = compressed_size
+            while remaining > 0:
+                chunk = self.pipe.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    raise EOFError("Pacote terminou antes do esperado")
+                remaining -= len(chunk)
+                yield chunk
+            return
+        
+        if method == 8:
+            decompressor = zlib.decompressobj(-15)
+        elif method == 12:
+            decompressor = bz2.BZ2Decompressor()
+        elif method == 14:
+            raise ValueError("Compressão LZMA em zip não suportada")
+        else:
+            raise ValueError(f"Método de compressão zip não suportado: {method}")
+        
+        remaining = compressed_size
+        while not decompressor.eof:
+            want = 1024 * 1024 if remaining is None else min(remaining, 1024 * 1024)
+            if want == 0:
+                break
+            chunk = self.pipe.read(want)
+            if not chunk:
+                raise EOFError("Pacote terminou antes do esperado")
+            if remaining is not None:
+                remaining -= len(chunk)
+            out = decompressor.decompress(chunk)
+            if out:
+                yield out
+        
+        # Sem tamanho no cabeçalho, o que sobrou após o fim do stream pertence ao próximo registro
+        self.pipe.unread(decompressor.unused_data)
+
+    def _skip_descriptor(self, zip64):
+        head = self.pipe.read_exact(4)
+        sizes = 16 if zip64 else 8
+        if struct.unpack("<I", head)[0] == self.DATA_DESCRIPTOR:
+            self.pipe.read_exact(4 + sizes)
+        else:
+            # Descritor sem assinatura: os 4 bytes lidos eram o CRC
+            self.pipe.read_exact(sizes)
+
+    @staticmethod
+    def _zip64_sizes(extra, size, compressed_size):
+        pos = 0
+        while pos + 4 <= len(extra):
+            header_id, length = struct.unpack("<HH", extra[pos:pos + 4])
+            if header_id == 0x0001:
+                field = extra[pos + 4:pos + 4 + length]
+                values = list(struct.unpack(f"<{len(field) // 8}Q", field[:len(field) // 8 * 8]))
+                if size == 0xFFFFFFFF and values:
+                    size = values.pop(0)
+                if compressed_size == 0xFFFFFFFF and values:
+                    compressed_size = values.pop(0)
+                break
+            pos += 4 + length
+        return size, compressed_size
+
+class ArchiveInstaller:
+    """Instala um jogo distribuído como .zip ou .tar(.gz/.xz/.bz2), extraindo enquanto baixa.
+    
+    Download e extração rodam em threads separadas ligadas por um BoundedPipe, então
+    o tempo total é o maior dos dois e o pacote nunca é gravado inteiro em disco.
+    """
+    def __init__(self, url, install_dir, archive_type, on_progress=None, should_continue=None,
+                 throttle=None, hash_algo="md5", expected_digest=None, store_algo=None):
+        self.url = url
+        self.install_dir = install_dir
+        self.staging_dir = install_dir + ".part"
+        self.archive_type = archive_type
+        self.on_progress = on_progress
+        self.should_continue = should_continue or (lambda: True)
+        self.throttle = throttle
+        self.hash_algo = hash_algo
+        self.expected_digest = expected_digest
+        self.digest = None
+        # Digest de cada arquivo extraído (caminho relativo -> digest), calculado enquanto é gravado
+        self.store_algo = store_algo
+        self.file_digests = {}
+        self.total_size = 0
+        self.downloaded = 0
+        self._hasher = HashEngine.new(hash_algo)
+        self._pipe = BoundedPipe()
+        self._last_progress = 0
+
+    def run(self):
+        if os.path.exists(self.staging_dir):
+            shutil.rmtree(self.staging_dir)
+        os.makedirs(self.staging_dir)
+        
+        network = threading.Thread(target=self._download_stage, daemon=True)
+        network.start()
+        
+        try:
+            if self.archive_type == "zip":
+                self._extract_zip()
+            else:
+                self._extract_tar()
+            # O restante do pacote (ex.: diretório central do zip) ainda entra no hash
+            while self._pipe.read(1024 * 1024):
+                pass
+        except BaseException as e:
+            self._pipe.abort(e)
+            network.join()
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+            raise
+        
+        network.join()
+        self.digest = self._hasher.hexdigest()
+        if self.expected_digest and self.digest != self.expected_digest.lower():
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+            raise IntegrityError("Checksum do pacote baixado não confere")
+        
+        self._swap_into_place()
+        return self.install_dir
+
+    def _download_stage(self):
+        try:
+            with HttpClient.get(self.url, stream=True) as r:
+                r.raise_for_status()
+                self.total_size = int(r.headers.get("content-length", 0))
+                readinto = Downloader._body_reader(r)
+                buf = bytearray(Config.DOWNLOAD_MAX_CHUNK_SIZE)
+                view = memoryview(buf)
+                sizer = ChunkSizer(self.throttle)
+                
+                while True:
+                    if not self.should_continue():
+                        raise DownloadCancelled()
+                    size = sizer.next_size()
+                    started = time.perf_counter()
+                    n = readinto(view[:size])
+                    if not n:
+                        break
+                    sizer.record(size, n, time.perf_counter() - started)
+                    
+                    # O pipe guarda o bloco até o extrator consumir, então aqui a cópia é necessária
+                    chunk = bytes(view[:n])
+                    self._hasher.update(chunk)
+                    if self.throttle:
+                        self.throttle.consume(n)
+                    self._pipe.write(chunk)
+                    DOWNLOAD_BYTES.inc(n)
+                    self.downloaded += n
+                    self._notify_progress()
+                r.raw.read()
+            
+            if self.total_size and self.downloaded != self.total_size:
+                raise IOError("Download incompleto ou arquivo corrompido")
+            self._notify_progress(force=True)
+            self._pipe.close()
+        except BaseException as e:
+            self._pipe.abort(e)
+
+    def _notify_progress(self, force=False):
+        now = time.monotonic()
+        if self.on_progress and (force or now - self._last_progress >= Downloader.PROGRESS_INTERVAL):
+            self._last_progress = now
+            self.on_progress(self.downloaded, self.total_size)
+
+    def _extract_tar(self):
+        # Modo "r|*": leitura sequencial com detecção automática de gzip/xz/bz2
+        with tarfile.open(fileobj=self._pipe, mode="r|*") as tar:
+            for member in tar:
+                target = self._safe_path(member.name)
+                if member.isdir():
+                    os.makedirs(target, exist_ok=True)
+                elif member.isfile():
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    source = tar.extractfile(member)
+                    hasher = MultiHasher(self.store_algo)
+                    with open(target, "wb") as f:
+                        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                            hasher.update(chunk)
+                            f.write(chunk)
+                    self._record_digest(target, hasher)
+                    if os.name == "posix":
+                        os.chmod(target, member.mode & 0o755 | 0o600)
+                # Links e arquivos especiais são ignorados: podem apontar para fora do diretório
+
+    def _extract_zip(self):
+        for name, is_dir, data, crc in StreamingZipReader(self._pipe).entries():
+            target = self._safe_path(name)
+            if is_dir:
+                os.makedirs(target, exist_ok=True)
+                continue
+            
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            checksum = 0
+            hasher = MultiHasher(self.store_algo)
+            with open(target, "wb") as f:
+                for chunk in data:
+                    checksum = zlib.crc32(chunk, checksum)
+                    hasher.update(chunk)
+                    f.write(chunk)
+            if crc and checksum != crc:
+                raise IntegrityError(f"CRC inválido no pacote: {name}")
+            self._record_digest(target, hasher)
+
+    def _record_digest(self, target, hasher):
+        if self.store_algo:
+            self.file_digests[os.path.relpath(target, self.staging_dir)] = hasher.hexdigest(self.store_algo)
+
+    def _safe_path(self, name):
+        """Caminho dentro do diretório de instalação; recusa nomes absolutos ou com '..'"""
+        root = os.path.abspath(self.staging_dir)
+        target = os.path.abspath(os.path.join(root, name.replace("\\", "/").lstrip("/")))
+        if os.path.commonpath([root, target]) != root:
+            raise ValueError(f"Caminho inválido no pacote: {name}")
+        return target
+
+    def _swap_into_place(self):
+        """Troca a instalação antiga pela nova com renames, sem janela em que o jogo fique pela metade"""
+        old_dir = self.install_dir + ".old"
+        if os.path.exists(old_dir):
+            shutil.rmtree(old_dir)
+        if os.path.exists(self.install_dir):
+            os.replace(self.install_dir, old_dir)
+        os.replace(self.staging_dir, self.install_dir)
+        Downloader._fsync_dir(os.path.dirname(os.path.abspath(self.install_dir)))
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+# ====================== ATUALIZAÇÃO POR BLOCOS ======================
+class DeltaUnavailable(Exception):
+    pass
+
+class DeltaUpdater:
+    """Atualiza um arquivo instalado baixando só os blocos que mudaram (estilo zsync).
+    
+    O servidor publica, ao lado do download, o manifesto gerado por HashEngine.hash_blocks:
+    {"algo", "size", "block_size", "digest", "blocks": [...]}.
+    """
+    MAX_RANGE_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, url, manifest_url, dest_path, on_progress=None, should_continue=None,
+                 throttle=None, expected=None, store_algo=None):
+        self.url = url
+        self.manifest_url = manifest_url
+        self.dest_path = dest_path
+        self.on_progress = on_progress
+        self.should_continue = should_continue or (lambda: True)
+        self.throttle = throttle
+        self.expected = expected
+        self.hash_algo = None
+        self.digest = None
+        self.store_algo = store_algo
+        self.store_digest = None
+        self.total_size = 0
+        self.downloaded = 0
+        self._lock = threading.Lock()
+        self._last_progress = 0
+
+    @staticmethod
+    def manifest_url_for(game):
+        """URL do manifesto: campo block_manifest ou o caminho do download com sufixo .blocks.json"""
+        if game.get("block_manifest"):
+            return game["block_manifest"]
+        parts = urlsplit(game["download_url"])
+        return parts._replace(path=parts.path + ".blocks.json").geturl()
+
+    def run(self):
+        manifest = self._fetch_manifest()
+        self.hash_algo = manifest["algo"]
+        block_size = manifest["block_size"]
+        size = manifest["size"]
+        
+        # Os blocos locais são comparados na mesma posição; só os diferentes são baixados
+        local_blocks = HashEngine.hash_blocks(self.dest_path, self.hash_algo, block_size)["blocks"]
+        changed = [i for i, digest in enumerate(manifest["blocks"])
+                   if i >= len(local_blocks) or local_blocks[i] != digest]
+        ranges = self._merge_ranges(changed, block_size, size)
+        self.total_size = sum(end - start + 1 for start, end in ranges)
+        self._notify_progress(force=True)
+        
+        # O patch é aplicado numa cópia; a instalação só é trocada depois que o resultado confere
+        staged_path = self.dest_path + ".part"
+        ContentStore._remove(staged_path)
+        ContentStore._clone(self.dest_path, staged_path)
+        try:
+            with open(staged_path, "r+b", buffering=0) as f:
+                if os.path.getsize(staged_path) != size:
+                    f.truncate(size)
+                for start, end in ranges:
+                    if not self.should_continue():
+                        raise DownloadCancelled()
+                    self._fetch_range(f, start, end)
+                os.fsync(f.fileno())
+            
+            # Manifesto, catálogo e armazenamento conferidos numa única leitura da cópia
+            digests = HashEngine.hash_file_multi(
+                staged_path, (self.hash_algo, self.expected and self.expected[0], self.store_algo))
+            self.digest = digests[self.hash_algo]
+            if self.digest != manifest["digest"]:
+                raise IntegrityError("Arquivo atualizado não confere com o manifesto")
+            if self.expected and digests[self.expected[0]] != self.expected[1]:
+                raise IntegrityError("Checksum do arquivo atualizado não confere")
+            if self.expected:
+                # Registra o digest do catálogo, como os outros caminhos de instalação
+                self.hash_algo, self.digest = self.expected
+            self.store_digest = digests.get(self.store_algo)
+        except BaseException:
+            ContentStore._remove(staged_path)
+            raise
+        
+        os.replace(staged_path, self.dest_path)
+        Downloader._fsync_dir(os.path.dirname(os.path.abspath(self.dest_path)))
+        self._notify_progress(force=True)
+        return self.dest_path
+
+    def _fetch_manifest(self):
+        try:
+            r = HttpClient.get(self.manifest_url)
+            if r.status_code == 404:
+                raise DeltaUnavailable("Manifesto de blocos não publicado")
+            r.raise_for_status()
+            manifest = r.json()
+            for field in ("algo", "size", "block_size", "digest", "blocks"):
+                if field not in manifest:
+                    raise DeltaUnavailable(f"Manifesto sem o campo {field}")
+        except DeltaUnavailable:
+            raise
+        except Exception as e:
+            raise DeltaUnavailable(f"Manifesto de blocos indisponível: {e}")
+        
+        if manifest["algo"] not in HashEngine.ALGORITHMS:
+            raise DeltaUnavailable(f"Algoritmo do manifesto não suportado: {manifest['algo']}")
+        # Um manifesto de outra versão não pode ser usado para chegar ao digest do catálogo
+        if self.expected and self.expected[0] == manifest["algo"] and self.expected[1] != manifest["digest"].lower():
+            raise DeltaUnavailable("Manifesto não corresponde à versão do catálogo")
+        return manifest
+
+    def _merge_ranges(self, changed, block_size, size):
+        ranges = []
+        for i in changed:
+            start = i * block_size
+            end = min(start + block_size, size) - 1
+            if ranges and ranges[-1][1] + 1 == start and end - ranges[-1][0] < self.MAX_RANGE_SIZE:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+        return [tuple(r) for r in ranges]
+
+    def _fetch_range(self, f, start, end):
+        headers = {"Range": f"bytes={start}-{end}"}
+        with HttpClient.get(self.url, headers=headers, stream=True) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise DeltaUnavailable("O servidor não aceita pedidos de intervalo")
+            
+            readinto = Downloader._body_reader(r)
+            buf = bytearray(Config.DOWNLOAD_MAX_CHUNK_SIZE)
+            view = memoryview(buf)
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                n = readinto(view[:min(remaining, len(buf))])
+                if not n:
+                    raise IOError("Conexão encerrada antes do fim do bloco")
+                if self.throttle:
+                    self.throttle.consume(n)
+                pending = view[:n]
+                with DOWNLOAD_WRITE_SECONDS.timer():
+                    while pending:
+                        pending = pending[f.write(pending):]
+                DOWNLOAD_BYTES.inc(n)
+                remaining -= n
+                self.downloaded += n
+                self._notify_progress()
+            r.raw.read()
+
+    def _notify_progress(self, force=False):
+        now = time.monotonic()
+        if self.on_progress and (force or now - self._last_progress >= Downloader.PROGRESS_INTERVAL):
+            self._last_progress = now
+            self.on_progress(self.downloaded, self.total_size)
+
+# ====================== FILA DE DOWNLOADS ======================
+class TokenBucket:
+    """Limitador de banda compartilhado por todas as conexões (bytes/s)"""
+    def __init__(self, rate):
+        self._lock = threading.Lock()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        with self._lock:
+            self.rate = max(0, rate)
+            # Permite rajadas de até meio segundo de banda
+            self.capacity = self.rate / 2
+            self.tokens = self.capacity
+            self.last = time.monotonic()
+
+    def consume(self, amount):
+        with self._lock:
+            if self.rate <= 0:
+                return
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            # O saldo pode ficar negativo; quem consome espera a dívida ser paga
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        
+        if wait > 0:
+            time.sleep(wait)
+
+class DownloadJob:
+    STATUS_TEXT = {
+        "queued": "Na fila",
+        "downloading": "Baixando",
+        "paused": "Pausado",
+        "done": "Concluído",
+        "failed": "Falhou"
+    }
+
+    def __init__(self, game, seq):
+        self.game = game
+        self.key = GameManager.install_key(game)
+        self.seq = seq  # posição na fila; move() troca a de dois jobs
+        self.status = "queued"
+        self.downloaded = 0
+        self.total_size = 0
+        self.error = None
+        self.pause_requested = False
+
+    @property
+    def percent(self):
+        if self.total_size <= 0:
+            return 0
+        return int((self.downloaded / self.total_size) * 100)
+
+class DownloadManager:
+    """Fila global reordenável, com limite de downloads simultâneos e de banda"""
+    def __init__(self, max_concurrent=None, bandwidth_limit=None,
+                 on_complete=None, on_failed=None, integrity=None, bus=None, store=None, installs=None):
+        self.integrity = integrity
+        self.store = store
+        self.installs = installs
+        self.bus = bus or ProgressBus()
+        self.max_concurrent = max_concurrent or Config.MAX_CONCURRENT_DOWNLOADS
+        self.throttle = TokenBucket(Config.BANDWIDTH_LIMIT if bandwidth_limit is None else bandwidth_limit)
+        self.on_complete = on_complete
+        self.on_failed = on_failed
+        
+        self.jobs = {}
+        self._heap = []
+        self._active = set()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._stopping = False
+
+    def enqueue(self, game):
+        """Adiciona um jogo à fila; cliques repetidos reaproveitam o mesmo job"""
+        with self._lock:
+            job = self.jobs.get(GameManager.install_key(game))
+            if job and job.status in ("queued", "downloading"):
+                return job
+            
+            job = DownloadJob(game, self._next_seq())
+            self.jobs[job.key] = job
+            heapq.heappush(self._heap, (job.seq, job.key))
+        
+        self._notify(job)
+        self._schedule()
+        return job
+
+    def pause(self, key):
+        with self._lock:
+            job = self.jobs.get(key)
+            if not job:
+                return
+            if job.status == "queued":
+                job.status = "paused"
+            elif job.status == "downloading":
+                # O worker percebe o pedido no próximo bloco e salva o estado para retomar
+                job.pause_requested = True
+        self._notify(job)
+
+    def resume(self, key):
+        with self._lock:
+            job = self.jobs.get(key)
+            if not job or job.status not in ("paused", "failed"):
+                return
+            job.status = "queued"
+            job.error = None
+            job.seq = self._next_seq()
+            heapq.heappush(self._heap, (job.seq, job.key))
+        self._notify(job)
+        self._schedule()
+
+    def move(self, key, offset):
+        """Troca a posição do job com o vizinho na fila (-1 sobe, +1 desce)"""
+        with self._lock:
+            queued = self._queued_jobs()
+            job = self.jobs.get(key)
+            if job not in queued:
+                return
+            i = queued.index(job)
+            j = i + offset
+            if not 0 <= j < len(queued):
+                return
+            other = queued[j]
+            job.seq, other.seq = other.seq, job.seq
+            for moved in (job, other):
+                heapq.heappush(self._heap, (moved.seq, moved.key))
+        self._notify(job)
+        self._notify(other)
+
+    def ordered_jobs(self):
+        """Jobs na ordem de exibição: ativos, fila e depois os demais"""
+        rank = {"downloading": 0, "queued": 1, "paused": 2, "failed": 3, "done": 4}
+        with self._lock:
+            return sorted(self.jobs.values(), key=lambda j: (rank[j.status], j.seq))
+
+    def shutdown(self):
+        self._stopping = True
+
+    def _queued_jobs(self):
+        queued = [j for j in self.jobs.values() if j.status == "queued"]
+        return sorted(queued, key=lambda j: j.seq)
+
+    def _next_seq(self):
+        self._seq += 1
+        return self._seq
+
+    def _schedule(self):
+        started = []
+        with self._lock:
+            while not self._stopping and len(self._active) < self.max_concurrent and self._heap:
+                seq, key = heapq.heappop(self._heap)
+                job = self.jobs.get(key)
+                # Entradas antigas (reordenadas ou pausadas) são descartadas aqui
+                if not job or job.status != "queued" or job.seq != seq:
+                    continue
+                job.status = "downloading"
+                job.pause_requested = False
+                self._active.add(key)
+                started.append(job)
+        
+        for job in started:
+            self._notify(job)
+            threading.Thread(target=self._run_job, args=(job,), daemon=True).start()
+
+    def _run_job(self, job):
+        exe_path = GameManager.exe_path(job.game)
+        archive_type = GameManager.archive_type(job.game)
+        
+        def on_progress(downloaded, total_size):
+            job.downloaded = downloaded
+            job.total_size = total_size
+            self._notify(job)
+        
+        algo, expected_digest = HashEngine.expected_digest(job.game) or ("md5", None)
+        store_algo = ContentStore.ALGO if self.store else None
+        
+        should_continue = lambda: not (self._stopping or job.pause_requested)
+        
+        try:
+            if archive_type:
+                installer = ArchiveInstaller(
+                    job.game["download_url"], GameManager.install_dir(job.game), archive_type,
+                    on_progress=on_progress,
+                    should_continue=should_continue,
+                    throttle=self.throttle,
+                    hash_algo=algo,
+                    expected_digest=expected_digest,
+                    store_algo=store_algo)
+                installer.run()
+            else:
+                # Instalado do armazenamento local: a referência já foi registrada por materialize
+                store_digest = None
+                verified = self._install_from_store(job, exe_path, algo, expected_digest)
+                if verified is None:
+                    updater = self._delta_update(job, exe_path, on_progress, should_continue, store_algo)
+                    if updater is None:
+                        updater = Downloader(
+                            job.game["download_url"], exe_path,
+                            on_progress=on_progress,
+                            should_continue=should_continue,
+                            throttle=self.throttle,
+                            hash_algo=algo,
+                            expected_digest=expected_digest,
+                            mirrors=job.game.get("mirrors"),
+                            store_algo=store_algo)
+                        updater.run()
+                    verified = (updater.hash_algo, updater.digest)
+                    store_digest = updater.store_digest
+            
+            if os.path.exists(exe_path) and os.path.getsize(exe_path) > 0:
+                # Deduplica antes de registrar: trocar o arquivo por um reflink do objeto muda o inode.
+                # Os digests do armazenamento vêm da passada de hash do download ou da extração
+                if self.store:
+                    if archive_type:
+                        self.store.ingest_tree(GameManager.install_dir(job.game), installer.file_digests)
+                    elif store_digest:
+                        self.store.ingest(exe_path, store_digest, verified)
+                if archive_type:
+                    # Registra o executável extraído para as verificações futuras
+                    verified = (algo, HashEngine.hash_file(exe_path, algo))
+                if self.integrity:
+                    # O digest foi calculado durante o download; a primeira execução não precisa refazer
+                    self.integrity.record(exe_path, *verified)
+                if self.installs:
+                    self.installs.mark_installed(job.key, exe_path, *verified)
+                job.status = "done"
+            elif archive_type:
+                job.status = "failed"
+                job.error = f"Executável {job.game['exe_name']} não encontrado no pacote"
+            else:
+                job.status = "failed"
+                job.error = "Download incompleto ou arquivo corrompido"
+        except DownloadCancelled:
+            job.status = "paused"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        
+        with self._lock:
+            self._active.discard(job.key)
+        
+        self._notify(job)
+        if job.status == "done" and self.on_complete:
+            self.on_complete(job)
+        elif job.status == "failed" and self.on_failed:
+            self.on_failed(job)
+        
+        self._schedule()
+
+    def _install_from_store(self, job, exe_path, algo, expected_digest):
+        """Conteúdo já presente no armazenamento local (de outro jogo ou versão): instala sem baixar"""
+        if not (self.store and expected_digest):
+            return None
+        if not self.store.materialize(algo, expected_digest, exe_path):
+            return None
+        return (algo, expected_digest.lower())
+
+    def _delta_update(self, job, exe_path, on_progress, should_continue, store_algo):
+        """Tenta atualizar um arquivo já instalado só com os blocos alterados; o DeltaUpdater
+        concluído, ou None se não der"""
+        if not os.path.exists(exe_path):
+            return None
+        
+        updater = DeltaUpdater(
+            job.game["download_url"], DeltaUpdater.manifest_url_for(job.game), exe_path,
+            on_progress=on_progress,
+            should_continue=should_continue,
+            throttle=self.throttle,
+            expected=HashEngine.expected_digest(job.game),
+            store_algo=store_algo)
+        
+        try:
+            updater.run()
+        except DownloadCancelled:
+            raise
+        except Exception as e:
+            # Qualquer falha deixa a instalação intacta e cai no download completo.
+            # Na saída de erro: com --json, a saída padrão da linha de comando só tem JSON
+            print(f"Atualização por blocos indisponível para {job.game['title']}: {e}", file=sys.stderr)
+            return None
+        
+        # O arquivo só mudou agora, com a troca já gravada
+        if self.integrity:
+            self.integrity.invalidate(exe_path)
+        if self.store:
+            self.store.release(exe_path)
+        return updater
+
+    def _notify(self, job):
+        self.bus.publish(ProgressEvent(job.key, job.status, job.downloaded, job.total_size,
+                                       time.monotonic(), job.error))
+
+class DownloadsWindow:
+    """Janela única com o progresso de todos os downloads"""
+    def __init__(self, root, manager):
+        self.root = root
+        self.manager = manager
+        self.window = None
+        self.rows = {}
+        self.rates = {}
+        self.frame_interval = max(1, int(1000 / Config.FPS))
+        # Os workers só acordam o Tk; a leitura dos eventos acontece no máximo uma vez por quadro
+        self.subscription = manager.bus.subscribe(wakeup=lambda: self.root.after(0, self._drain))
+
+    def _drain(self):
+        events = self.subscription.drain()
+        if not events:
+            return
+        
+        for event in events:
+            rate = self.rates.setdefault(event.key, TransferRate())
+            if event.status == "downloading":
+                rate.update(event.downloaded, event.timestamp)
+            else:
+                rate.rate = None
+            job = self.manager.jobs.get(event.key)
+            if job:
+                self.refresh(job)
+        
+        self.root.after(self.frame_interval, self._drain)
+
+    def show(self):
+        if self.window and self.window.winfo_exists():
+            self.window.deiconify()
+            self.window.lift()
+            return
+        
+        self.window = tk.Toplevel(self.root)
+        self.window.title("Downloads")
+        self.window.geometry("760x360")
+        self.window.configure(bg=Config.BG_COLOR)
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+        
+        self.list_frame = tk.Frame(self.window, bg=Config.BG_COLOR)
+        self.list_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.rows = {}
+        self.refresh_all()
+
+    def refresh_all(self):
+        if not (self.window and self.window.winfo_exists()):
+            return
+        for job in self.manager.ordered_jobs():
+            self.refresh(job)
+            self.rows[job.key]["frame"].pack_forget()
+        for job in self.manager.ordered_jobs():
+            self.rows[job.key]["frame"].pack(fill="x", pady=4)
+
+    def refresh(self, job):
+        if not (self.window and self.window.winfo_exists()):
+            return
+        row = self.rows.get(job.key)
+        if row is None:
+            row = self._create_row(job)
+            self.rows[job.key] = row
+        
+        row["progress"]["value"] = job.percent
+        status = DownloadJob.STATUS_TEXT[job.status]
+        if job.status == "downloading":
+            status = f"{status} {job.percent}%"
+            rate = self.rates.get(job.key)
+            if rate and rate.rate:
+                status += f" · {Utils.format_bytes(rate.rate)}/s"
+                eta = rate.eta(max(0, job.total_size - job.downloaded))
+                if eta is not None and job.total_size:
+                    status += f" · {Utils.format_duration(eta)}"
+        elif job.status == "failed" and job.error:
+            status = f"{status}: {job.error}"
+        row["status"].config(text=status)
+        row["toggle"].config(text="⏸" if job.status in ("queued", "downloading") else "▶",
+                             state="disabled" if job.status == "done" else "normal")
+
+    def _create_row(self, job):
+        frame = tk.Frame(self.list_frame, bg=Config.CARD_BG, padx=8, pady=6)
+        frame.pack(fill="x", pady=4)
+        
+        tk.Label(frame, text=job.game["title"], font=("Arial", 12, "bold"),
+                 fg=Config.TEXT_COLOR, bg=Config.CARD_BG, width=20, anchor="w").pack(side="left")
+        
+        progress = ttk.Progressbar(frame, length=200, mode="determinate")
+        progress.pack(side="left", padx=8)
+        
+        status = tk.Label(frame, font=("Arial", 10), fg=Config.TEXT_COLOR, bg=Config.CARD_BG,
+                          width=32, anchor="w")
+        status.pack(side="left")
+        
+        toggle = tk.Button(frame, width=2, command=lambda k=job.key: self._toggle(k))
+        toggle.pack(side="left", padx=2)
+        tk.Button(frame, text="▲", width=2,
+                  command=lambda k=job.key: self._move(k, -1)).pack(side="left", padx=2)
+        tk.Button(frame, text="▼", width=2,
+                  command=lambda k=job.key: self._move(k, 1)).pack(side="left", padx=2)
+        
+        return {"frame": frame, "progress": progress, "status": status, "toggle": toggle}
+
+    def _toggle(self, key):
+        job = self.manager.jobs.get(key)
+        if job and job.status in ("queued", "downloading"):
+            self.manager.pause(key)
+        else:
+            self.manager.resume(key)
+
+    def _move(self, key, offset):
+        self.manager.move(key, offset)
+        self.refresh_all()
+
+# ====================== CACHE DE MINIATURAS ======================
+class ThumbnailCache:
+    """Miniaturas pré-redimensionadas em disco, decodificadas num pool e guardadas num LRU de PhotoImage"""
+    PLACEHOLDER_COLOR = "#333333"
+
+    def __init__(self, root, size, memory_budget=None, workers=None):
+        self.root = root
+        self.size = size
+        self.memory_budget = memory_budget or Config.THUMBNAIL_MEMORY_BUDGET
+        self._photos = OrderedDict()
+        self._bytes = 0
+        self._pending = {}
+        self._placeholder = None
+        self._pool = ThreadPoolExecutor(max_workers=workers or Config.THUMBNAIL_WORKERS)
+        os.makedirs(Config.THUMBNAILS_DIR, exist_ok=True)
+
+    def placeholder(self):
+        if self._placeholder is None:
+            self._placeholder = ImageTk.PhotoImage(Image.new("RGB", self.size, self.PLACEHOLDER_COLOR))
+        return self._placeholder
+
+    def request(self, image_path, callback):
+        """Retorna o PhotoImage se já estiver em memória; senão agenda a decodificação
+        e chama callback(photo) na thread do Tk quando estiver pronto."""
+        src = os.path.join(Config.ASSETS_DIR, image_path)
+        photo = self._photos.get(src)
+        if photo is not None:
+            self._photos.move_to_end(src)
+            return photo
+        
+        callbacks = self._pending.get(src)
+        if callbacks is not None:
+            callbacks.append(callback)
+            return None
+        
+        self._pending[src] = [callback]
+        future = self._pool.submit(self._load, src)
+        future.add_done_callback(lambda f: self.root.after(0, self._deliver, src, f))
+        return None
+
+    def preload(self, image_path, should_continue):
+        """Decodifica uma miniatura que ainda não está na tela; desiste se should_continue()
+        estiver falso quando o pool chegar nela"""
+        src = os.path.join(Config.ASSETS_DIR, image_path)
+        if src in self._photos or src in self._pending:
+            return
+        self._pending[src] = []
+        future = self._pool.submit(lambda: self._load(src) if should_continue() else None)
+        future.add_done_callback(lambda f: self.root.after(0, self._deliver, src, f))
+
+    def _load(self, src):
+        """Executa no pool: lê a miniatura do disco ou gera a partir do original"""
+        with THUMBNAIL_DECODE_SECONDS.timer():
+            return self._decode(src)
+
+    def _decode(self, src):
+        try:
+            mtime = os.stat(src).st_mtime_ns
+        except OSError:
+            return Image.new("RGB", self.size, self.PLACEHOLDER_COLOR)
+        
+        key = hashlib.sha1(f"{os.path.abspath(src)}|{mtime}|{self.size[0]}x{self.size[1]}".encode()).hexdigest()
+        thumb_path = os.path.join(Config.THUMBNAILS_DIR, key + ".png")
+        
+        try:
+            img = Image.open(thumb_path)
+            img.load()
+            return img
+        except:
+            pass
+        
+        try:
+            img = Image.open(src).convert("RGB")
+            img = img.resize(self.size, Image.LANCZOS)
+        except:
+            return Image.new("RGB", self.size, self.PLACEHOLDER_COLOR)
+        
+        try:
+            tmp_path = f"{thumb_path}.{threading.get_ident()}.tmp"
+            img.save(tmp_path, "PNG")
+            os.replace(tmp_path, thumb_path)
+        except OSError:
+            pass
+        return img
+
+    def _deliver(self, src, future):
+        callbacks = self._pending.pop(src, [])
+        try:
+            img = future.result()
+        except Exception:
+            img = Image.new("RGB", self.size, self.PLACEHOLDER_COLOR)
+        
+        if img is None:
+            # Pré-carregamento cancelado; um card que pediu a miniatura nesse meio tempo ainda espera por ela
+            if callbacks:
+                self._pending[src] = callbacks
+                retry = self._pool.submit(self._load, src)
+                retry.add_done_callback(lambda f: self.root.after(0, self._deliver, src, f))
+            return
+        
+        # O PhotoImage só pode ser criado na thread do Tk
+        photo = ImageTk.PhotoImage(img)
+        self._store(src, photo, img.width * img.height * 4)
+        
+        for callback in callbacks:
+            try:
+                callback(photo)
+            except tk.TclError:
+                # O widget foi destruído antes da miniatura ficar pronta
+                pass
+
+    def _store(self, src, photo, nbytes):
+        self._photos[src] = photo
+        photo._cache_bytes = nbytes
+        self._bytes += nbytes
+        while self._bytes > self.memory_budget and len(self._photos) > 1:
+            _, evicted = self._photos.popitem(last=False)
+            self._bytes -= evicted._cache_bytes
+
+# ====================== PRÉ-CARREGAMENTO ======================
+class LaunchPrefetcher:
+    """Prepara o lançamento do jogo focado: depois de PREFETCH_DWELL_MS no mesmo card,
+    confere a integridade (o launch_game passa a achar o digest no cache), leva o
+    executável e os dados ao cache de páginas do sistema e decodifica as miniaturas vizinhas.
+    
+    Mudar o foco cancela o trabalho em andamento.
+    """
+    def __init__(self, root, game_manager, thumbnails):
+        self.root = root
+        self.game_manager = game_manager
+        self.thumbnails = thumbnails
+        self._after_id = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def focus(self, game, neighbours=()):
+        self.cancel()
+        self._after_id = self.root.after(Config.PREFETCH_DWELL_MS, self._start, game, list(neighbours))
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._cancel.set()
+
+    def _start(self, game, neighbours):
+        self._after_id = None
+        cancel = self._cancel = threading.Event()
+        should_continue = lambda: not cancel.is_set()
+        
+        for neighbour in neighbours:
+            self.thumbnails.preload(neighbour["image"], should_continue)
+        
+        if self.game_manager.is_game_installed(game):
+            threading.Thread(target=self._warm_up, args=(game, should_continue), daemon=True).start()
+
+    def _warm_up(self, game, should_continue):
+        # Um prefetch por vez: o do card anterior termina (cancelado) antes deste ler o disco
+        with self._lock:
+            try:
+                hashed = self._verify(game, should_continue)
+                budget = Config.PREFETCH_MAX_BYTES
+                for path in self._launch_files(game):
+                    if budget <= 0 or not should_continue():
+                        break
+                    if path == hashed:
+                        # O hash acabou de ler o executável inteiro
+                        continue
+                    budget -= self._warm_file(path, budget, should_continue)
+            except (DownloadCancelled, OSError):
+                pass
+
+    def _verify(self, game, should_continue):
+        """Confere o executável e grava o digest no cache de integridade; retorna o caminho se precisou ler o arquivo"""
+        target = self.game_manager.verification_target(game)
+        if target is None:
+            return None
+        exe_path, algo, expected = target
+        integrity = self.game_manager.integrity
+        if integrity.lookup(exe_path, algo) == expected:
+            return None
+        
+        digest = HashEngine.hash_file(exe_path, algo, should_continue)
+        if digest == expected:
+            integrity.record(exe_path, algo, digest)
+        return exe_path
+
+    def _launch_files(self, game):
+        """Executável primeiro; em pacotes, depois os demais arquivos do jogo"""
+        exe_path = self.game_manager.exe_path(game)
+        yield exe_path
+        if not self.game_manager.archive_type(game):
+            return
+        for dirpath, _, filenames in os.walk(self.game_manager.install_dir(game)):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if path != exe_path:
+                    yield path
+
+    @staticmethod
+    def _warm_file(path, budget, should_continue):
+        """Pede ao sistema para ler o arquivo para o cache; retorna quantos bytes foram pedidos"""
+        with open(path, "rb") as f:
+            length = min(os.fstat(f.fileno()).st_size, budget)
+            if hasattr(os, "posix_fadvise"):
+                # A leitura antecipada fica com o kernel, sem ocupar esta thread
+                os.posix_fadvise(f.fileno(), 0, length, os.POSIX_FADV_WILLNEED)
+                return length
+            
+            # Sem fadvise (Windows): lê em blocos, descartando o conteúdo
+            buf = bytearray(Config.HASH_BUFFER_SIZE)
+            read = 0
+            while read < length and should_continue():
+                n = f.readinto(buf)
+                if not n:
+                    break
+                read += n
+            return read
+
+# ====================== ANIMAÇÃO ======================
+class Tween:
+    def __init__(self, duration, on_update, on_done=None, easing=None):
+        self.duration = max(duration, 1e-6)
+        self.on_update = on_update
+        self.on_done = on_done
+        self.easing = easing or Animator.ease_out
+        self.start = time.perf_counter()
+
+class Animator:
+    """Agenda animações em root.after a Config.FPS.
+    
+    Cada tween é calculado a partir do tempo decorrido, então um quadro que
+    estoura o orçamento faz os seguintes pularem em vez de atrasar a animação.
+    Sem tweens ativos não há nenhum timer agendado.
+    """
+    def __init__(self, root, fps=None):
+        self.root = root
+        self.frame_interval = 1.0 / (fps or Config.FPS)
+        self.tweens = {}
+        self._after_id = None
+        self._next_deadline = None
+
+    @staticmethod
+    def linear(t):
+        return t
+
+    @staticmethod
+    def ease_out(t):
+        return 1 - (1 - t) ** 3
+
+    def animate(self, key, duration, on_update, on_done=None, easing=None):
+        """Inicia um tween; um novo tween com a mesma chave substitui o anterior"""
+        self.tweens[key] = Tween(duration, on_update, on_done, easing)
+        if self._after_id is None:
+            self._next_deadline = time.perf_counter()
+            self._after_id = self.root.after_idle(self._tick)
+
+    def cancel(self, key):
+        self.tweens.pop(key, None)
+
+    def _tick(self):
+        begin = time.perf_counter()
+        
+        for key, tween in list(self.tweens.items()):
+            t = min(1.0, (begin - tween.start) / tween.duration)
+            try:
+                tween.on_update(tween.easing(t))
+            except tk.TclError:
+                # O widget animado foi destruído
+                t = 1.0
+            if t >= 1.0 and self.tweens.get(key) is tween:
+                del self.tweens[key]
+                if tween.on_done:
+                    tween.on_done()
+        
+        end = time.perf_counter()
+        FRAME_SECONDS.observe(end - begin)
+        
+        if not self.tweens:
+            self._after_id = None
+            return
+        
+        # Próximo quadro alinhado à grade de FPS; quadros já perdidos são pulados
+        self._next_deadline += self.frame_interval
+        if end > self._next_deadline:
+            missed = int((end - self._next_deadline) / self.frame_interval) + 1
+            DROPPED_FRAMES.inc(missed)
+            self._next_deadline += missed * self.frame_interval
+        delay = max(1, int((self._next_deadline - end) * 1000))
+        self._after_id = self.root.after(delay, self._tick)
+
+# ====================== GRADE DE CARDS ======================
+class CardGrid:
+    """Grade virtualizada de cards: só as linhas visíveis (mais um overscan) têm widgets, que são reciclados"""
+    COLUMNS = 3
+    PADDING = 40
+    OVERSCAN_ROWS = 1
+
+    FOCUS_DURATION = 0.15
+
+    def __init__(self, parent, thumbnails, is_installed, on_launch, on_download, animator=None):
+        self.parent = parent
+        self.animator = animator
+        self.thumbnails = thumbnails
+        self.is_installed = is_installed
+        self.on_launch = on_launch
+        self.on_download = on_download
+        
+        self.games = []
+        self.slots = {}
+        self.free_slots = []
+        self.top_row = 0
+        self.selected_index = 0
+        
+        self.row_height = Config.CARD_HEIGHT + self.PADDING
+        self.start_x = (Config.WIDTH - (self.COLUMNS * (Config.CARD_WIDTH + self.PADDING))) // 2
+        
+        parent.bind("<MouseWheel>", self._on_mouse_wheel)
+        parent.bind("<Button-4>", lambda e: self.scroll(-1))
+        parent.bind("<Button-5>", lambda e: self.scroll(1))
+
+    @property
+    def row_count(self):
+        return (len(self.games) + self.COLUMNS - 1) // self.COLUMNS
+
+    def visible_rows(self):
+        """Quantidade de linhas que cabem inteiras na área visível"""
+        height = self.parent.winfo_height()
+        if height <= 1:
+            height = Config.HEIGHT - 180
+        return max(1, height // self.row_height)
+
+    def set_games(self, games):
+        for index in list(self.slots):
+            self._release(index)
+        self.games = games
+        self.top_row = 0
+        self.selected_index = 0
+        self.render()
+
+    def refresh_installed(self, keys):
+        """Atualiza os cards visíveis dos jogos (chaves de instalação) cujo estado de instalação mudou"""
+        for index, slot in self.slots.items():
+            if GameManager.install_key(self.games[index]) in keys:
+                self._bind_slot(slot, index)
 
-    @staticmethod
-    def run_as_admin():
-        ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, " ".join(sys.argv), None, None, 1)
-        sys.exit()
+    def select(self, index):
+        """Seleciona o card e rola a grade para mantê-lo visível"""
+        previous = self.selected_index
+        self.selected_index = index
+        row = index // self.COLUMNS
+        top_row = self.top_row
+        if row < top_row:
+            top_row = row
+        elif row >= top_row + self.visible_rows():
+            top_row = row - self.visible_rows() + 1
+        
+        if top_row != self.top_row:
+            self.top_row = top_row
+            self.render()
+        else:
+            # Sem rolagem, só os cards da seleção anterior e da nova mudam
+            for i in (previous, index):
+                slot = self.slots.get(i)
+                if slot:
+                    self._paint_selection(slot, i == index)
+        
+        slot = self.slots.get(index)
+        if self.animator and slot:
+            # A borda do card focado acende gradualmente; o índice sozinho não basta,
+            # pois depois de set_games ele passa a apontar para outro jogo
+            slot["frame"].config(highlightbackground=Config.CARD_BG)
+            self.animator.animate(
+                "card_focus", self.FOCUS_DURATION,
+                lambda t, s=slot, i=index, g=slot["game"]: s["game"] is g and i == self.selected_index and
+                    s["frame"].config(highlightbackground=Utils.lerp_color(Config.CARD_BG, Config.SELECTED_COLOR, t)))
 
-    @staticmethod
-    def hsv_to_rgb(h, s, v):
-        h_i = int(h*6)
-        f = h*6 - h_i
-        p = v * (1 - s)
-        q = v * (1 - f*s)
-        t = v * (1 - (1 - f)*s)
+    def neighbours(self, index, rows):
+        """Jogos das `rows` linhas acima e abaixo do card que ainda não têm widget"""
+        row = index // self.COLUMNS
+        first = max(0, row - rows) * self.COLUMNS
+        last = min(len(self.games), (row + rows + 1) * self.COLUMNS)
+        return [self.games[i] for i in range(first, last) if i not in self.slots]
+
+    def activate(self):
+        """Executa a ação (jogar ou baixar) do card selecionado"""
+        slot = self.slots.get(self.selected_index)
+        if slot and slot["action"]:
+            slot["action"]()
+
+    def scroll(self, rows):
+        max_top = max(0, self.row_count - self.visible_rows())
+        new_top = min(max_top, max(0, self.top_row + rows))
+        if new_top != self.top_row:
+            self.top_row = new_top
+            self.render()
+
+    def render(self):
+        with CARD_RENDER_SECONDS.timer():
+            self._render()
+
+    def _render(self):
+        first_row = max(0, self.top_row - self.OVERSCAN_ROWS)
+        last_row = min(self.row_count, self.top_row + self.visible_rows() + 1 + self.OVERSCAN_ROWS)
+        wanted = range(first_row * self.COLUMNS, min(len(self.games), last_row * self.COLUMNS))
         
-        if h_i == 0: r, g, b = v, t, p
-        elif h_i == 1: r, g, b = q, v, p
-        elif h_i == 2: r, g, b = p, v, t
-        elif h_i == 3: r, g, b = p, q, v
-        elif h_i == 4: r, g, b = t, p, v
-        else: r, g, b = v, p, q
+        # Devolve ao pool os cards que saíram da janela visível
+        for index in list(self.slots):
+            if index not in wanted:
+                self._release(index)
+        
+        for index in wanted:
+            slot = self.slots.get(index)
+            if slot is None:
+                slot = self.free_slots.pop() if self.free_slots else self._create_slot()
+                self.slots[index] = slot
+                self._bind_slot(slot, index)
             
-        return f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
+            row, col = divmod(index, self.COLUMNS)
+            position = (self.start_x + col * (Config.CARD_WIDTH + self.PADDING),
+                        (row - self.top_row) * self.row_height)
+            if slot["position"] != position:
+                slot["frame"].place(x=position[0], y=position[1])
+                slot["position"] = position
+            self._paint_selection(slot, index == self.selected_index)
 
-    @staticmethod
-    def md5(file_path):
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+    def _paint_selection(self, slot, selected):
+        if slot["selected"] == selected:
+            return
+        slot["selected"] = selected
+        border_color = Config.SELECTED_COLOR if selected else Config.CARD_BG
+        slot["frame"].config(highlightbackground=border_color)
 
-# ====================== GERENCIADOR DE ÁUDIO ======================
-class AudioManager:
-    def __init__(self):
-        self.sounds = {}
-        self.setup_audio()
+    def _release(self, index):
+        slot = self.slots.pop(index)
+        slot["frame"].place_forget()
+        slot["game"] = None
+        slot["position"] = None
+        slot["action"] = None
+        self.free_slots.append(slot)
 
-    def setup_audio(self):
-        try:
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
-            
-            for name, path in Config.SOUNDS.items():
-                full_path = os.path.join(Config.ASSETS_DIR, path)
-                if os.path.exists(full_path):
-                    self.sounds[name] = pygame.mixer.Sound(full_path)
-                    self.sounds[name].set_volume(0.7)
-                else:
-                    self._create_fallback_sound(name)
-        except Exception as e:
-            print(f"Erro ao inicializar áudio: {e}")
-            self._create_all_fallback_sounds()
+    def _create_slot(self):
+        card_frame = tk.Frame(self.parent, bg=Config.CARD_BG,
+                              width=Config.CARD_WIDTH, height=Config.CARD_HEIGHT,
+                              relief="raised", borderwidth=3,
+                              highlightthickness=3, highlightbackground=Config.CARD_BG)
+        
+        img_label = tk.Label(card_frame, image=self.thumbnails.placeholder(), bg=Config.CARD_BG)
+        img_label.pack(pady=10)
+        
+        title_label = tk.Label(card_frame, font=("Arial", 16, "bold"),
+                               fg=Config.TEXT_COLOR, bg=Config.CARD_BG,
+                               wraplength=Config.CARD_WIDTH-20)
+        title_label.pack(pady=5)
+        
+        size_label = tk.Label(card_frame, font=("Arial", 12),
+                              fg=Config.TEXT_COLOR, bg=Config.CARD_BG)
+        size_label.pack(pady=5)
+        
+        action_btn = tk.Label(card_frame, font=("Arial", 14, "bold"),
+                              fg=Config.TEXT_COLOR,
+                              padx=15, pady=5,
+                              relief="raised",
+                              borderwidth=2)
+        action_btn.pack(pady=10)
+        
+        slot = {
+            "frame": card_frame,
+            "image": img_label,
+            "title": title_label,
+            "size": size_label,
+            "action_btn": action_btn,
+            "action": None,
+            "colors": None,
+            "game": None,
+            "position": None,
+            "selected": False
+        }
+        # Os bindings são feitos uma vez; reciclar o card só troca a ação e as cores
+        action_btn.bind("<Enter>", lambda e: action_btn.config(bg=slot["colors"][1]))
+        action_btn.bind("<Leave>", lambda e: action_btn.config(bg=slot["colors"][0]))
+        action_btn.bind("<Button-1>", lambda e: slot["action"] and slot["action"]())
+        return slot
 
-    def _create_fallback_sound(self, name):
-        samples = []
-        duration = 0.3
+    def _bind_slot(self, slot, index):
+        """Associa um card do pool ao jogo de posição index"""
+        game = self.games[index]
+        slot["game"] = game
         
-        if name == "startup": freq = 523.25
-        elif name == "confirm": freq = 783.99
-        elif name == "back": freq = 392.00
-        else: freq = 659.25
-            
-        for i in range(int(22050 * duration)):
-            value = int(32767 * 0.3 * math.sin(2 * math.pi * freq * i / 22050))
-            samples.append(value)
+        installed = self.is_installed(game)
         
-        self.sounds[name] = pygame.mixer.Sound(buffer=bytearray(samples))
+        slot["title"].config(text=game["title"])
+        slot["size"].config(text=f"Tamanho: {game['size']}")
+        
+        # Miniatura: placeholder até o cache entregar, ignorando entregas para cards já reciclados
+        # ou reaproveitados por outro jogo na mesma posição depois de uma nova busca
+        photo = self.thumbnails.request(
+            game["image"], lambda p, s=slot, g=game: s["game"] is g and self._set_image(s, p))
+        self._set_image(slot, photo if photo is not None else self.thumbnails.placeholder())
+        
+        if installed:
+            slot["action"] = lambda key=GameManager.install_key(game): self.on_launch(key)
+            slot["colors"] = (Config.DOWNLOAD_BTN_COLOR, "#ff4f8d")
+            slot["action_btn"].config(text="▶ JOGAR", bg=slot["colors"][0])
+        else:
+            slot["action"] = lambda g=game: self.on_download(g)
+            slot["colors"] = ("#4CAF50", "#5cbf5c")
+            slot["action_btn"].config(text="⬇ DOWNLOAD", bg=slot["colors"][0])
 
-    def _create_all_fallback_sounds(self):
-        for name in Config.SOUNDS.keys():
-            self._create_fallback_sound(name)
+    def _set_image(self, slot, photo):
+        slot["image"].config(image=photo)
+        slot["image"].image = photo
 
-    def play(self, sound_name):
-        if sound_name in self.sounds:
+    def _on_mouse_wheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
+
+# ====================== ENTRADA ======================
+InputAction = namedtuple("InputAction", "name timestamp")
+
+class InputThread:
+    """Lê o controle numa thread própria, bloqueada em pygame.event.wait.
+    
+    Eventos viram ações normalizadas ("up", "down", "left", "right", "select",
+    "back", ...) entregues à thread do Tk por uma fila; root.after só é chamado
+    quando a fila estava vazia. O teclado chega pelo Tk (dono da janela; o SDL
+    não tem janela e nunca recebe teclas) e entra na mesma fila por push().
+    """
+    REPORT_FLAG = "--input-report"
+    DIRECTIONS = {(0, 1): "up", (0, -1): "down", (-1, 0): "left", (1, 0): "right"}
+
+    def __init__(self, root, on_action, on_ready=None, startup=None):
+        self.root = root
+        self.on_action = on_action
+        self.on_ready = on_ready
+        self.startup = startup or StartupTimer()
+        self.joystick = None
+        self.running = True
+        self.axes = [0.0, 0.0]
+        self.stick_direction = None
+        self.held = {}  # origem ("stick", "hat") -> [direção, próxima repetição]
+        self.latencies = deque(maxlen=256)
+        self._queue = queue.SimpleQueue()
+        self._pending = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        if "pygame" in sys.modules:
             try:
-                self.sounds[sound_name].play()
-            except:
+                # Acorda o event.wait para a thread terminar
+                pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+            except Exception:
                 pass
+            if self._thread.is_alive() and self._thread is not threading.current_thread():
+                self._thread.join(timeout=0.5)
 
-# ====================== GERENCIADOR DE JOGOS ======================
-class GameManager:
-    def __init__(self):
-        self.games = self._load_games()
-        self.create_directories()
+    def push(self, name):
+        """Ação de outra origem (as teclas, vindas do Tk); passa pela mesma fila e medição de latência"""
+        self._emit(name, time.perf_counter())
+
+    def stats(self):
+        """Latência entre o evento do controle e o quadro desenhado (em segundos)"""
+        times = sorted(self.latencies)
+        return {
+            "samples": len(times),
+            "avg_latency": sum(times) / len(times) if times else 0.0,
+            "p95_latency": times[int(len(times) * 0.95)] if times else 0.0,
+            "max_latency": times[-1] if times else 0.0
+        }
 
-    def _load_games(self):
+    def _run(self):
+        # Os eventos do SDL precisam ser lidos na thread que inicializou o vídeo
         try:
-            with open(os.path.join(Config.ASSETS_DIR, "games.json"), "r") as f:
-                return json.load(f)
-        except:
-            return [
-                {
-                    "title": "Jogo de Teste",
-                    "image": "games/test_game.jpg",
-                    "size": "10 MB",
-                    "exe_name": "ChromeSetup.exe",
-                    "download_url": "https://drive.usercontent.google.com/download?id=1sbAijvGUPPnt5nG2kv_6Cp0DSCCZGtNV&export=download&authuser=0",
-                    "md5": "d41d8cd98f00b204e9800998ecf8427e"
-                }
-            ]
+            with self.startup.phase("controle"):
+                pygame.display.init()
+                pygame.joystick.init()
+                if pygame.joystick.get_count() > 0:
+                    self._open_joystick(0)
+        except Exception as e:
+            print(f"Erro no controle: {e}")
+            return
+        if self.on_ready:
+            self.on_ready()
+        
+        while self.running:
+            # Sem direção segurada, bloqueia sem prazo: parado, não há nenhum polling
+            timeout = self._next_repeat_timeout()
+            event = pygame.event.wait(timeout) if timeout else pygame.event.wait()
+            now = time.perf_counter()
+            if event.type != pygame.NOEVENT:
+                self._handle_event(event, now)
+            self._repeat_held(now)
 
-    def create_directories(self):
-        os.makedirs(Config.DOWNLOADS_DIR, exist_ok=True)
-        os.makedirs(os.path.join(Config.ASSETS_DIR, "audio"), exist_ok=True)
-        os.makedirs(os.path.join(Config.ASSETS_DIR, "games"), exist_ok=True)
+    def _open_joystick(self, device_index):
+        self.joystick = pygame.joystick.Joystick(device_index)
+        self.joystick.init()
 
-    def is_game_installed(self, exe_name):
-        exe_path = os.path.join(Config.DOWNLOADS_DIR, exe_name)
-        return os.path.exists(exe_path)
+    def _next_repeat_timeout(self):
+        if not self.held:
+            return 0
+        deadline = min(next_repeat for _, next_repeat in self.held.values())
+        return max(1, int((deadline - time.perf_counter()) * 1000))
 
-    def verify_game_integrity(self, exe_name, expected_md5):
-        exe_path = os.path.join(Config.DOWNLOADS_DIR, exe_name)
-        if not os.path.exists(exe_path):
-            return False
-            
-        return Utils.md5(exe_path) == expected_md5
+    def _handle_event(self, event, now):
+        if event.type == pygame.JOYAXISMOTION and event.axis in (0, 1):
+            self.axes[event.axis] = event.value
+            self._update_stick(now)
+        
+        elif event.type == pygame.JOYHATMOTION:
+            self._set_held("hat", self.DIRECTIONS.get(tuple(event.value)), now)
+        
+        elif event.type == pygame.JOYBUTTONDOWN:
+            action = {0: "select", 1: "back", 2: "install_filter", 3: "size_filter"}.get(event.button)
+            if action:
+                self._emit(action, now)
+        
+        elif event.type == pygame.JOYDEVICEADDED and self.joystick is None:
+            self._open_joystick(event.device_index)
+
+    def _update_stick(self, now):
+        """Direção do analógico com histerese: pressiona além do limiar, solta só dentro da zona morta"""
+        x, y = self.axes
+        magnitude = max(abs(x), abs(y))
+        if magnitude < Config.STICK_DEADZONE:
+            direction = None
+        elif magnitude < Config.STICK_PRESS_THRESHOLD:
+            return
+        elif abs(x) > abs(y):
+            direction = "left" if x < 0 else "right"
+        else:
+            direction = "up" if y < 0 else "down"  # o eixo Y do analógico cresce para baixo
+        self._set_held("stick", direction, now)
+
+    def _set_held(self, source, direction, now):
+        """Dispara só na mudança de estado (borda); a repetição fica por conta do temporizador"""
+        current = self.held.get(source)
+        if current and current[0] == direction:
+            return
+        if direction is None:
+            self.held.pop(source, None)
+            return
+        self.held[source] = [direction, now + Config.INPUT_REPEAT_DELAY]
+        self._emit(direction, now)
+
+    def _repeat_held(self, now):
+        for held in self.held.values():
+            if now >= held[1]:
+                held[1] = now + Config.INPUT_REPEAT_INTERVAL
+                self._emit(held[0], now)
+
+    def _emit(self, name, timestamp):
+        self._queue.put(InputAction(name, timestamp))
+        if not self._pending.is_set():
+            self._pending.set()
+            self.root.after(0, self._drain)
+
+    def _drain(self):
+        """Roda na thread do Tk: aplica as ações pendentes e mede até o próximo quadro"""
+        self._pending.clear()
+        while True:
+            try:
+                action = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self.on_action(action.name)
+            # after_idle roda depois do redesenho que a ação agendou
+            self.root.after_idle(lambda t=action.timestamp: self._record_latency(time.perf_counter() - t))
+
+    def _record_latency(self, latency):
+        self.latencies.append(latency)
+        INPUT_LATENCY_SECONDS.observe(latency)
 
 # ====================== INTERFACE GRÁFICA ======================
+class ScreenManager:
+    """Constrói cada tela uma única vez e alterna entre elas sem recriar widgets.
+    
+    Mudanças de dados enquanto uma tela está escondida ficam marcadas como sujas
+    e são entregues ao on_show dela na próxima exibição.
+    """
+    def __init__(self):
+        self.screens = {}
+        self.current = None
+
+    def register(self, name, build, on_show=None):
+        """build() cria e retorna o widget raiz da tela (sem empacotá-lo)"""
+        self.screens[name] = {"build": build, "on_show": on_show, "widget": None, "dirty": {}}
+
+    def show(self, name):
+        if self.current == name:
+            return
+        screen = self.screens[name]
+        if self.current:
+            self.screens[self.current]["widget"].pack_forget()
+        if screen["widget"] is None:
+            screen["widget"] = screen["build"]()
+            screen["dirty"] = {}  # recém-construída, já está atualizada
+        screen["widget"].pack(fill="both", expand=True)
+        self.current = name
+        
+        dirty, screen["dirty"] = screen["dirty"], {}
+        if dirty and screen["on_show"]:
+            screen["on_show"](dirty)
+
+    def is_visible(self, name):
+        return self.current == name
+
+    def mark_dirty(self, name, key, items=()):
+        """Registra uma mudança para a tela aplicar quando voltar a aparecer"""
+        self.screens[name]["dirty"].setdefault(key, set()).update(items)
+
 class GameLauncherUI:
-    def __init__(self, root):
+    # Teclas tratadas pelo Tk; segurar uma seta usa a repetição nativa do sistema
+    KEY_ACTIONS = {
+        "<Up>": "up", "<Down>": "down", "<Left>": "left", "<Right>": "right",
+        "<Return>": "select", "<Escape>": "back", "<F5>": "reverify"
+    }
+    INSTALL_FILTERS = [("Todos", None), ("Instalados", True), ("Não instalados", False)]
+    SIZE_FILTERS = [
+        ("Qualquer tamanho", None, None),
+        ("Até 1 GB", None, 1024**3),
+        ("1 a 10 GB", 1024**3, 10 * 1024**3),
+        ("Acima de 10 GB", 10 * 1024**3, None)
+    ]
+
+    def __init__(self, root, startup=None):
         self.root = root
+        self.startup = startup or StartupTimer()
+        self.animator = Animator(root)
         self.setup_window()
-        self.audio = AudioManager()
+        self.startup.mark("janela")
+        
+        # Áudio e pygame carregam em segundo plano; o som de abertura toca quando estiverem prontos
+        self.audio = AudioManager(background=True, on_ready=lambda audio: audio.play("startup"),
+                                  startup=self.startup)
         self.game_manager = GameManager()
-        self.joystick = None
+        self.game_manager.load_games_async(
+            lambda func, *args: self.root.after(0, func, *args),
+            on_change=self.on_catalog_changed,
+            on_loaded=self.on_catalog_loaded)
+        self.download_manager = DownloadManager(
+            integrity=self.game_manager.integrity,
+            store=self.game_manager.store,
+            installs=self.game_manager.installs,
+            on_complete=lambda job: self.root.after(0, self._download_complete, job.game),
+            on_failed=lambda job: self.root.after(0, self._download_failed, job.error))
+        self.downloads_window = DownloadsWindow(self.root, self.download_manager)
+        self.thumbnails = ThumbnailCache(self.root, (Config.CARD_WIDTH-20, int(Config.CARD_HEIGHT*0.6)))
+        self.prefetcher = LaunchPrefetcher(self.root, self.game_manager, self.thumbnails)
+        self.input = None
+        Metrics.start_export()
+        self.startup.mark("gerenciadores")
         
-        self.current_screen = "main"
         self.menu_items = ["Jogos", "Sair"]
         self.selected_index = 0
-        self.game_cards = []
+        self.card_grid = None
         self.selected_card_index = 0
+        self.search_query = ""
+        self.install_filter = 0
+        self.size_filter = 0
         self.running = True
         
-        self.setup_joystick()
-        self.setup_main_menu()
-        self.start_control_loop()
+        self.screens = ScreenManager()
+        self.screens.register("main", self.setup_main_menu)
+        self.screens.register("games", self.setup_games_menu, on_show=self.on_games_shown)
+        self.screens.show("main")
+        self.root.bind("<Key>", self.on_key_press)
+        for sequence, action in self.KEY_ACTIONS.items():
+            self.root.bind(sequence, lambda e, a=action: self.key_action(a))
+        self.startup.mark("menu principal")
         
-        self.audio.play("startup")
+        # O controle só é iniciado depois que o primeiro quadro foi desenhado
+        self.root.after_idle(self._on_first_frame)
         self.animate_title()
 
+    def _on_first_frame(self):
+        self.startup.mark("primeiro quadro")
+        self.root.after(1, self._deferred_init)
+
+    def _deferred_init(self):
+        self.input = InputThread(self.root, self.handle_action, startup=self.startup)
+        self.input.start()
+
+    @property
+    def current_screen(self):
+        return self.screens.current
+
     def setup_window(self):
         self.root.title("Game Launcher Premium")
         self.root.geometry(f"{Config.WIDTH}x{Config.HEIGHT}")
@@ -204,18 +4006,8 @@ class GameLauncherUI:
         y = (screen_height - Config.HEIGHT) // 2
         self.root.geometry(f"+{x}+{y}")
 
-    def setup_joystick(self):
-        try:
-            pygame.joystick.init()
-            if pygame.joystick.get_count() > 0:
-                self.joystick = pygame.joystick.Joystick(0)
-                self.joystick.init()
-        except Exception as e:
-            print(f"Erro no controle: {e}")
-
     def setup_main_menu(self):
         self.main_canvas = tk.Canvas(self.root, bg=Config.BG_COLOR, highlightthickness=0)
-        self.main_canvas.pack(fill="both", expand=True)
         
         # Título
         self.title_text = self.main_canvas.create_text(
@@ -228,6 +4020,7 @@ class GameLauncherUI:
         # Itens do menu
         self.menu_rects = []
         self.menu_texts = []
+        self.painted_index = None
         
         for i, item in enumerate(self.menu_items):
             y_pos = Config.HEIGHT//2 + i*80
@@ -243,7 +4036,7 @@ class GameLauncherUI:
             text = self.main_canvas.create_text(
                 Config.WIDTH//2, y_pos,
                 text=item,
-                font=("Arial", 24),
+                font=("Arial", 20),
                 fill=Config.TEXT_COLOR,
                 tags=f"menu_text_{i}")
             
@@ -251,18 +4044,17 @@ class GameLauncherUI:
             self.menu_texts.append(text)
         
         self.update_selection()
+        return self.main_canvas
 
     def animate_title(self):
-        for i in range(0, 360, 5):
-            if not self.running: return
-            color = Utils.hsv_to_rgb(i/360, 0.8, 1)
-            self.main_canvas.itemconfig("title", fill=color)
-            self.root.update()
-            time.sleep(0.05)
+        # Um ciclo completo de matiz em 3,6 s, como a animação original
+        self.animator.animate(
+            "title", 3.6,
+            lambda t: self.main_canvas.itemconfig("title", fill=Utils.hsv_to_rgb(min(t, 0.999), 0.8, 1)),
+            easing=Animator.linear)
 
     def setup_games_menu(self):
         self.games_canvas = tk.Canvas(self.root, bg=Config.BG_COLOR, highlightthickness=0)
-        self.games_canvas.pack(fill="both", expand=True)
         
         # Título
         self.games_canvas.create_text(
@@ -271,6 +4063,12 @@ class GameLauncherUI:
             font=("Arial", 36, "bold"),
             fill=Config.SELECTED_COLOR)
         
+        # Busca e filtros
+        self.search_text = self.games_canvas.create_text(
+            Config.WIDTH//2, 100,
+            font=("Arial", 14),
+            fill=Config.TEXT_COLOR)
+        
         # Frame para os cards
         self.cards_frame = tk.Frame(self.games_canvas, bg=Config.BG_COLOR)
         self.cards_frame.place(x=0, y=120, width=Config.WIDTH, height=Config.HEIGHT-180)
@@ -288,100 +4086,120 @@ class GameLauncherUI:
         self.back_btn.bind("<Button-1>", lambda e: self.back_to_main())
         self.back_btn.bind("<Enter>", lambda e: self.back_btn.config(bg="#ffb733"))
         self.back_btn.bind("<Leave>", lambda e: self.back_btn.config(bg=Config.ACCENT_COLOR))
+        return self.games_canvas
 
     def create_game_cards(self):
-        self.game_cards = []
-        padding = 40
-        start_x = (Config.WIDTH - (3 * (Config.CARD_WIDTH + padding))) // 2
-        
-        for i, game in enumerate(self.game_manager.games):
-            row = i // 3
-            col = i % 3
-            
-            x = start_x + col * (Config.CARD_WIDTH + padding)
-            y = row * (Config.CARD_HEIGHT + padding)
-            
-            # Frame do card
-            card_frame = tk.Frame(self.cards_frame, bg=Config.CARD_BG, 
-                                 width=Config.CARD_WIDTH, height=Config.CARD_HEIGHT,
-                                 relief="raised", borderwidth=3)
-            card_frame.place(x=x, y=y)
-            
-            # Imagem do jogo
-            try:
-                img_path = os.path.join(Config.ASSETS_DIR, game["image"])
-                img = Image.open(img_path)
-                img = img.resize((Config.CARD_WIDTH-20, int(Config.CARD_HEIGHT*0.6)), Image.LANCZOS)
-                img_tk = ImageTk.PhotoImage(img)
-            except:
-                img = Image.new('RGB', (Config.CARD_WIDTH-20, int(Config.CARD_HEIGHT*0.6)), '#333333')
-                img_tk = ImageTk.PhotoImage(img)
-            
-            img_label = tk.Label(card_frame, image=img_tk, bg=Config.CARD_BG)
-            img_label.image = img_tk
-            img_label.pack(pady=10)
-            
-            # Título do jogo
-            title_label = tk.Label(card_frame, text=game["title"], 
-                                 font=("Arial", 16, "bold"), 
-                                 fg=Config.TEXT_COLOR, bg=Config.CARD_BG,
-                                 wraplength=Config.CARD_WIDTH-20)
-            title_label.pack(pady=5)
-            
-            # Tamanho do jogo
-            size_label = tk.Label(card_frame, text=f"Tamanho: {game['size']}", 
-                                font=("Arial", 12), 
-                                fg=Config.TEXT_COLOR, bg=Config.CARD_BG)
-            size_label.pack(pady=5)
-            
-            # Botão de ação
-            installed = self.game_manager.is_game_installed(game["exe_name"])
-            btn_text = "▶ JOGAR" if installed else "⬇ DOWNLOAD"
-            btn_color = Config.DOWNLOAD_BTN_COLOR if installed else "#4CAF50"
-            
-            action_btn = tk.Label(card_frame, text=btn_text, 
-                                font=("Arial", 14, "bold"), 
-                                fg=Config.TEXT_COLOR, bg=btn_color,
-                                padx=15, pady=5,
-                                relief="raised",
-                                borderwidth=2)
-            action_btn.pack(pady=10)
-            
-            # Efeitos hover
-            if installed:
-                action_btn.bind("<Enter>", lambda e, b=action_btn: b.config(bg="#ff4f8d"))
-                action_btn.bind("<Leave>", lambda e, b=action_btn: b.config(bg=Config.DOWNLOAD_BTN_COLOR))
-                action_btn.bind("<Button-1>", lambda e, exe=game["exe_name"]: self.launch_game(exe))
-            else:
-                action_btn.bind("<Enter>", lambda e, b=action_btn: b.config(bg="#5cbf5c"))
-                action_btn.bind("<Leave>", lambda e, b=action_btn: b.config(bg="#4CAF50"))
-                action_btn.bind("<Button-1>", lambda e, g=game: self.start_download(g))
-            
-            self.game_cards.append({
-                "frame": card_frame,
-                "action_btn": action_btn,
-                "installed": installed
-            })
+        self.card_grid = CardGrid(
+            self.cards_frame, self.thumbnails,
+            is_installed=self.game_manager.is_game_installed,
+            on_launch=self.launch_game,
+            on_download=self.start_download,
+            animator=self.animator)
+        self.apply_search()
+
+    def on_catalog_loaded(self):
+        self.startup.event("catálogo carregado")
+        self.refresh_install_state()
+
+    def refresh_install_state(self):
+        self.game_manager.refresh_installs(
+            callback=lambda changed: self.root.after(0, self.on_installs_changed, changed))
+
+    def on_installs_changed(self, changed):
+        if not self.card_grid:
+            return
+        if not self.screens.is_visible("games"):
+            self.screens.mark_dirty("games", "installs", changed)
+        elif self.INSTALL_FILTERS[self.install_filter][1] is not None:
+            self.apply_search(keep_selection=True)
+        else:
+            self.card_grid.refresh_installed(changed)
+
+    def on_catalog_changed(self):
+        if not self.card_grid:
+            return
+        if self.screens.is_visible("games"):
+            self.apply_search(keep_selection=True)
+        else:
+            self.screens.mark_dirty("games", "catalog")
+
+    def on_games_shown(self, dirty):
+        """Aplica só o que mudou enquanto a tela de jogos estava escondida"""
+        filtering_installed = self.INSTALL_FILTERS[self.install_filter][1] is not None
+        if "catalog" in dirty or ("installs" in dirty and filtering_installed):
+            self.apply_search(keep_selection=True)
+        elif "installs" in dirty:
+            self.card_grid.refresh_installed(dirty["installs"])
+
+    def apply_search(self, keep_selection=False):
+        """Refaz a lista de cards a partir da busca e dos filtros atuais"""
+        _, installed = self.INSTALL_FILTERS[self.install_filter]
+        _, min_size, max_size = self.SIZE_FILTERS[self.size_filter]
+        with Profiler.capture("search"):
+            results = self.game_manager.search(self.search_query, installed, min_size, max_size)
         
-        if self.game_cards:
+        self.card_grid.set_games(results)
+        if not keep_selection or self.selected_card_index >= len(results):
             self.selected_card_index = 0
-            self.highlight_selected_card()
+        self.highlight_selected_card()
+        self.update_search_text()
+
+    def update_search_text(self):
+        query = self.search_query or "digite para buscar"
+        install_label = self.INSTALL_FILTERS[self.install_filter][0]
+        size_label = self.SIZE_FILTERS[self.size_filter][0]
+        self.games_canvas.itemconfig(
+            self.search_text,
+            text=f"🔍 {query}   |   {install_label}   |   {size_label}   ({len(self.card_grid.games)})")
+
+    def cycle_install_filter(self):
+        self.install_filter = (self.install_filter + 1) % len(self.INSTALL_FILTERS)
+        self.apply_search()
+
+    def cycle_size_filter(self):
+        self.size_filter = (self.size_filter + 1) % len(self.SIZE_FILTERS)
+        self.apply_search()
+
+    def on_key_press(self, event):
+        """Busca digitando na tela de jogos"""
+        if self.current_screen != "games":
+            return
+        
+        if event.keysym == "BackSpace":
+            self.search_query = self.search_query[:-1]
+        elif event.keysym == "Tab":
+            self.cycle_install_filter()
+            return "break"
+        elif event.keysym == "Delete":
+            self.uninstall_selected()
+            return "break"
+        elif len(event.char) == 1 and event.char.isprintable():
+            self.search_query += event.char
+        else:
+            return
+        self.apply_search()
 
-    def launch_game(self, exe_name):
-        """Executa o jogo com múltiplos métodos de fallback"""
+    def launch_game(self, key):
+        """Executa o jogo (pela chave de instalação) com múltiplos métodos de fallback"""
         try:
-            exe_path = os.path.abspath(os.path.join(Config.DOWNLOADS_DIR, exe_name))
+            game = self.game_manager.catalog.find_by_key(key)
+            record = self.game_manager.installs.get(key)
+            exe_path = record.path if record else os.path.abspath(self.game_manager._exe_path_for(key))
             
             if not os.path.exists(exe_path):
+                # Removido por fora do launcher: o índice e o card deixam de mostrá-lo como instalado
+                self.game_manager.installs.mark_removed(key)
+                if self.card_grid:
+                    self.card_grid.refresh_installed({key})
                 messagebox.showerror("Erro", f"Arquivo não encontrado:\n{exe_path}")
                 return
             
             # Verifica integridade do arquivo
-            game = next((g for g in self.game_manager.games if g["exe_name"] == exe_name), None)
-            if game and "md5" in game:
-                if not self.game_manager.verify_game_integrity(exe_name, game["md5"]):
-                    messagebox.showerror("Erro", "Arquivo do jogo corrompido. Por favor, baixe novamente.")
-                    return
+            if game and not self.game_manager.verify_game(game):
+                # O download reaproveita os blocos intactos quando há manifesto publicado
+                if messagebox.askyesno("Erro", "Arquivo do jogo corrompido ou desatualizado. Atualizar agora?"):
+                    self.start_download(game)
+                return
             
             # Tenta diferentes métodos de execução
             methods = [
@@ -421,94 +4239,62 @@ class GameLauncherUI:
             return False
 
     def start_download(self, game):
-        """Inicia o download do jogo"""
+        """Coloca o jogo na fila de downloads"""
         try:
-            download_window = tk.Toplevel(self.root)
-            download_window.title(f"Download - {game['title']}")
-            download_window.geometry("500x200")
-            download_window.resizable(False, False)
-            
-            tk.Label(download_window, text=f"Baixando {game['title']}...", 
-                   font=("Arial", 16)).pack(pady=10)
-            
-            progress = ttk.Progressbar(download_window, length=400, mode="determinate")
-            progress.pack(pady=10)
-            
-            threading.Thread(target=self._download_game, args=(game, progress, download_window), daemon=True).start()
-            
+            self.download_manager.enqueue(game)
+            self.downloads_window.show()
         except Exception as e:
             messagebox.showerror("Erro", f"Falha ao iniciar download: {str(e)}")
 
-    def _download_game(self, game, progress, window):
+    def uninstall_selected(self):
+        """Remove do disco o jogo do card selecionado"""
+        if not self.card_grid or not self.card_grid.games:
+            return
+        game = self.card_grid.games[self.selected_card_index]
+        if not self.game_manager.is_game_installed(game):
+            return
+        if not messagebox.askyesno("Desinstalar", f"Remover {game['title']} do disco?"):
+            return
+        
         try:
-            exe_path = os.path.join(Config.DOWNLOADS_DIR, game["exe_name"])
-            
-            # Verifica se já existe e remove
-            if os.path.exists(exe_path):
-                os.remove(exe_path)
-            
-            with requests.get(game["download_url"], stream=True) as r:
-                r.raise_for_status()
-                total_size = int(r.headers.get('content-length', 0))
-                downloaded = 0
-                
-                with open(exe_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        if not self.running:  # Permite cancelar
-                            if os.path.exists(exe_path):
-                                os.remove(exe_path)
-                            return
-                            
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        progress_value = int((downloaded / total_size) * 100)
-                        progress["value"] = progress_value
-                        window.update()
-            
-            # Verifica se o download foi completado
-            if os.path.exists(exe_path) and os.path.getsize(exe_path) > 0:
-                self.root.after(0, self._download_complete, game, window)
-            else:
-                self.root.after(0, self._download_failed, "Download incompleto ou arquivo corrompido", window)
-            
+            self.game_manager.uninstall_game(game)
         except Exception as e:
-            self.root.after(0, self._download_failed, str(e), window)
-
-    def _download_complete(self, game, window):
-        window.destroy()
-        
-        for i, g in enumerate(self.game_manager.games):
-            if g["title"] == game["title"]:
-                card = self.game_cards[i]
-                card["action_btn"].config(text="▶ JOGAR", bg=Config.DOWNLOAD_BTN_COLOR)
-                card["action_btn"].bind("<Button-1>", lambda e, exe=game["exe_name"]: self.launch_game(exe))
-                card["action_btn"].bind("<Enter>", lambda e, b=card["action_btn"]: b.config(bg="#ff4f8d"))
-                card["action_btn"].bind("<Leave>", lambda e, b=card["action_btn"]: b.config(bg=Config.DOWNLOAD_BTN_COLOR))
-                card["installed"] = True
-                break
+            messagebox.showerror("Erro", f"Falha ao desinstalar: {str(e)}")
+            return
+        self.card_grid.refresh_installed({GameManager.install_key(game)})
+
+    def _download_complete(self, game):
+        if self.card_grid:
+            self.card_grid.refresh_installed({GameManager.install_key(game)})
         
         messagebox.showinfo("Sucesso", f"{game['title']} instalado com sucesso!")
 
-    def _download_failed(self, error, window):
-        window.destroy()
+    def _download_failed(self, error):
         messagebox.showerror("Erro", f"Falha no download: {error}")
 
     def back_to_main(self):
-        self.current_screen = "main"
-        self.games_canvas.pack_forget()
-        self.setup_main_menu()
+        self.prefetcher.cancel()
+        self.screens.show("main")
 
     def update_selection(self):
-        for i in range(len(self.menu_items)):
-            color = Config.SELECTED_COLOR if i == self.selected_index else Config.MENU_COLOR
-            font = ("Arial", 22, "bold") if i == self.selected_index else ("Arial", 20)
-            self.main_canvas.itemconfig(self.menu_rects[i], fill=color)
-            self.main_canvas.itemconfig(self.menu_texts[i], font=font)
+        """Redesenha só o item que perdeu a seleção e o que a ganhou"""
+        canvas, previous = self.main_canvas, self.painted_index
+        if previous is not None and previous != self.selected_index:
+            canvas.itemconfig(self.menu_rects[previous], fill=Config.MENU_COLOR)
+            canvas.itemconfig(self.menu_texts[previous], font=("Arial", 20))
+        canvas.itemconfig(self.menu_texts[self.selected_index], font=("Arial", 22, "bold"))
+        self.painted_index = self.selected_index
+        
+        # Transição de cor do item selecionado
+        rect = self.menu_rects[self.selected_index]
+        canvas.itemconfig(rect, fill=Config.MENU_COLOR)
+        self.animator.animate(
+            "menu_selection", 0.15,
+            lambda t: canvas.itemconfig(rect, fill=Utils.lerp_color(Config.MENU_COLOR, Config.SELECTED_COLOR, t)))
 
     def highlight_selected_card(self):
-        for i, card in enumerate(self.game_cards):
-            border_color = Config.SELECTED_COLOR if i == self.selected_card_index else Config.CARD_BG
-            card["frame"].config(highlightbackground=border_color, highlightthickness=3)
+        if self.card_grid:
+            self.card_grid.select(self.selected_card_index)
 
     def move_selection(self, direction):
         if self.current_screen == "main":
@@ -523,22 +4309,25 @@ class GameLauncherUI:
         self.audio.play("navigate")
 
     def move_card_selection(self, direction):
-        if not self.game_cards:
+        if not self.card_grid or not self.card_grid.games:
             return
-            
+        
+        last_index = len(self.card_grid.games) - 1
         if direction == "up":
-            new_index = max(0, self.selected_card_index - 3)
+            new_index = max(0, self.selected_card_index - CardGrid.COLUMNS)
         elif direction == "down":
-            new_index = min(len(self.game_cards) - 1, self.selected_card_index + 3)
+            new_index = min(last_index, self.selected_card_index + CardGrid.COLUMNS)
         elif direction == "left":
             new_index = max(0, self.selected_card_index - 1)
         else:  # right
-            new_index = min(len(self.game_cards) - 1, self.selected_card_index + 1)
+            new_index = min(last_index, self.selected_card_index + 1)
         
         if new_index != self.selected_card_index:
             self.selected_card_index = new_index
             self.highlight_selected_card()
             self.audio.play("navigate")
+            self.prefetcher.focus(self.card_grid.games[new_index],
+                                  self.card_grid.neighbours(new_index, Config.PREFETCH_NEIGHBOR_ROWS))
 
     def select_item(self):
         self.audio.play("confirm")
@@ -549,86 +4338,333 @@ class GameLauncherUI:
             else:
                 self.quit_app()
         else:
-            card = self.game_cards[self.selected_card_index]
-            for child in card["frame"].winfo_children():
-                if isinstance(child, tk.Label) and child.cget("text") in ["▶ JOGAR", "⬇ DOWNLOAD"]:
-                    child.event_generate("<Button-1>")
-                    break
+            if self.card_grid:
+                self.card_grid.activate()
 
     def show_games_menu(self):
-        self.current_screen = "games"
-        self.main_canvas.pack_forget()
-        self.setup_games_menu()
+        self.screens.show("games")
 
     def back_action(self):
         self.audio.play("back")
         if self.current_screen == "games":
             self.back_to_main()
 
-    def start_control_loop(self):
-        """Inicia o loop de controle usando root.after para evitar problemas de threading"""
-        self.process_joystick_events()
-        if self.running:
-            self.root.after(10, self.start_control_loop)
-
-    def process_joystick_events(self):
-        """Processa eventos do joystick e teclado"""
-        for event in pygame.event.get():
-            if event.type == pygame.JOYAXISMOTION:
-                if event.axis == 1:  # Eixo Y
-                    if event.value < -0.7:
-                        self.move_selection("up")
-                    elif event.value > 0.7:
-                        self.move_selection("down")
-                elif event.axis == 0:  # Eixo X
-                    if event.value < -0.7:
-                        self.move_selection("left")
-                    elif event.value > 0.7:
-                        self.move_selection("right")
-            
-            elif event.type == pygame.JOYHATMOTION:
-                if event.value[1] == 1:  # Cima
-                    self.move_selection("up")
-                elif event.value[1] == -1:  # Baixo
-                    self.move_selection("down")
-                elif event.value[0] == -1:  # Esquerda
-                    self.move_selection("left")
-                elif event.value[0] == 1:  # Direita
-                    self.move_selection("right")
-            
-            elif event.type == pygame.JOYBUTTONDOWN:
-                if event.button == 0:  # X
-                    self.select_item()
-                elif event.button == 1:  # Circle
-                    self.back_action()
-            
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    self.move_selection("up")
-                elif event.key == pygame.K_DOWN:
-                    self.move_selection("down")
-                elif event.key == pygame.K_LEFT:
-                    self.move_selection("left")
-                elif event.key == pygame.K_RIGHT:
-                    self.move_selection("right")
-                elif event.key == pygame.K_RETURN:
-                    self.select_item()
-                elif event.key == pygame.K_ESCAPE:
-                    self.back_action()
+    def key_action(self, action):
+        """Teclas entram na fila da InputThread para contarem na latência; antes dela, vão direto"""
+        if self.input:
+            self.input.push(action)
+        else:
+            self.handle_action(action)
+        return "break"
+
+    def handle_action(self, action):
+        """Ações normalizadas vindas da InputThread"""
+        with Profiler.capture(action):
+            self._dispatch_action(action)
+
+    def _dispatch_action(self, action):
+        if action in ("up", "down", "left", "right"):
+            self.move_selection(action)
+        elif action == "select":
+            self.select_item()
+        elif action == "back":
+            self.back_action()
+        elif action == "install_filter" and self.current_screen == "games":
+            self.cycle_install_filter()
+        elif action == "size_filter" and self.current_screen == "games":
+            self.cycle_size_filter()
+        elif action == "reverify":
+            self.reverify_games()
+
+    def reverify_games(self):
+        """Verificação completa sob demanda, fora da thread do Tk"""
+        self.refresh_install_state()
+        self.game_manager.reverify_all(
+            callback=lambda results: self.root.after(0, self._reverify_done, results))
+
+    def _reverify_done(self, results):
+        self.refresh_install_state()
+        corrupted = [title for title, ok in results.items() if not ok]
+        if corrupted:
+            messagebox.showwarning("Verificação", "Arquivos corrompidos:\n" + "\n".join(corrupted))
+        else:
+            messagebox.showinfo("Verificação", f"{len(results)} jogo(s) verificados sem erros.")
 
     def quit_app(self):
         self.running = False
-        pygame.quit()
+        if self.input:
+            self.input.stop()
+            if InputThread.REPORT_FLAG in sys.argv:
+                stats = self.input.stats()
+                print(f"[input] {stats['samples']} ações: média {stats['avg_latency'] * 1000:.1f} ms, "
+                      f"p95 {stats['p95_latency'] * 1000:.1f} ms, máx {stats['max_latency'] * 1000:.1f} ms")
+        self.download_manager.shutdown()
+        self.prefetcher.cancel()
+        if "pygame" in sys.modules:
+            pygame.quit()
+        HttpClient.close_all()
+        Metrics.stop_export()
+        Profiler.dump()
         self.root.destroy()
 
+# ====================== LINHA DE COMANDO ======================
+class CliReporter:
+    """Saída da linha de comando: uma linha legível por evento ou, com --json, um objeto JSON por linha"""
+    def __init__(self, json_output=False, stream=None):
+        self.json_output = json_output
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def emit(self, event, game=None, message="", **fields):
+        if self.json_output:
+            record = {"event": event}
+            if game is not None:
+                record["id"] = CommandLine.game_id(game)
+                record["title"] = game["title"]
+            if message:
+                record["message"] = message
+            record.update(fields)
+            line = json.dumps(record, ensure_ascii=False)
+        else:
+            parts = [f"{event:<10}"]
+            if game is not None:
+                parts.append(f"{CommandLine.game_id(game):<28}")
+            parts.append(message or " ".join(f"{k}={v}" for k, v in fields.items()))
+            line = " ".join(parts).rstrip()
+        
+        with self._lock:
+            print(line, file=self.stream, flush=True)
+
+class CommandLine:
+    """Operações do launcher sem interface gráfica, para preparar máquinas por script.
+    
+    Não abre janela nem pede elevação; o código de saída é 0 quando tudo deu certo.
+    """
+    COMMANDS = ("list", "install", "verify", "repair")
+
+    @staticmethod
+    def requested(argv):
+        """True se a linha de comando pede um subcomando (o primeiro argumento que não é opção)"""
+        args = [arg for arg in argv if not arg.startswith("-")]
+        return bool(args) and args[0] in CommandLine.COMMANDS
+
+    @staticmethod
+    def game_id(game):
+        return str(game.get("id") or game["exe_name"])
+
+    @staticmethod
+    def parse_args(argv):
+        parser = argparse.ArgumentParser(prog="main.py", description="Game Launcher sem interface gráfica")
+        parser.add_argument("--json", action="store_true", help="um objeto JSON por linha")
+        commands = parser.add_subparsers(dest="command", required=True)
+        
+        # Opções compartilhadas, aceitas depois do subcomando; o --json do subcomando usa SUPPRESS
+        # para não apagar, com o próprio default, um --json dado antes dele
+        output = argparse.ArgumentParser(add_help=False)
+        output.add_argument("--json", action="store_true", default=argparse.SUPPRESS,
+                            help="um objeto JSON por linha")
+        downloads = argparse.ArgumentParser(add_help=False)
+        downloads.add_argument("--jobs", type=int, default=Config.MAX_CONCURRENT_DOWNLOADS,
+                               help="downloads simultâneos")
+        downloads.add_argument("--bandwidth", type=int, default=Config.BANDWIDTH_LIMIT,
+                               help="limite de banda em bytes/s (0 = sem limite)")
+        hashing = argparse.ArgumentParser(add_help=False)
+        hashing.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                             help="processos calculando hash em paralelo")
+        
+        commands.add_parser("list", parents=[output], help="lista o catálogo e o estado de instalação")
+        
+        install = commands.add_parser("install", parents=[output, downloads], help="instala jogos do catálogo")
+        install.add_argument("games", nargs="+", help="ids (ou exe_name) dos jogos, ou 'all'")
+        install.add_argument("--force", action="store_true", help="baixa de novo os já instalados")
+        
+        commands.add_parser("verify", parents=[output, hashing],
+                            help="recalcula o hash de todos os jogos instalados")
+        commands.add_parser("repair", parents=[output, downloads, hashing],
+                            help="verifica e baixa de novo os jogos corrompidos ou ausentes")
+        return parser.parse_args(argv)
+
+    @staticmethod
+    def run(argv):
+        args = CommandLine.parse_args(argv)
+        reporter = CliReporter(args.json)
+        manager = GameManager()
+        manager.load_games()
+        
+        try:
+            if args.command == "list":
+                return CommandLine.list_games(manager, reporter)
+            if args.command == "install":
+                return CommandLine.install(manager, reporter, args)
+            if args.command == "verify":
+                failed = CommandLine.verify(manager, reporter, args.workers)
+                return 1 if failed else 0
+            return CommandLine.repair(manager, reporter, args)
+        except KeyboardInterrupt:
+            reporter.emit("interrupted", message="Interrompido")
+            return 130
+        finally:
+            HttpClient.close_all()
+            manager.installs.close()
+
+    @staticmethod
+    def list_games(manager, reporter):
+        # O índice pode estar defasado se arquivos foram apagados ou copiados à mão
+        manager.installs.scan(manager.install_paths(), manager.integrity)
+        for game in manager.games:
+            installed = manager.is_game_installed(game)
+            reporter.emit("game", game, installed=installed, size=game.get("size", ""),
+                          message=f"{'instalado' if installed else '-':<10} {game.get('size', ''):>10}  {game['title']}")
+        return 0
+
+    @staticmethod
+    def select_games(manager, names):
+        """Jogos pedidos na linha de comando, na ordem do catálogo; levanta SystemExit para ids desconhecidos"""
+        if "all" in names:
+            return list(manager.games)
+        wanted = set(names)
+        games = [g for g in manager.games if CommandLine.game_id(g) in wanted or g["exe_name"] in wanted]
+        found = {CommandLine.game_id(g) for g in games} | {g["exe_name"] for g in games}
+        unknown = wanted - found
+        if unknown:
+            raise SystemExit(f"Jogos não encontrados no catálogo: {', '.join(sorted(unknown))}")
+        return games
+
+    @staticmethod
+    def install(manager, reporter, args):
+        games = CommandLine.select_games(manager, args.games)
+        if not args.force:
+            for game in games:
+                if manager.is_game_installed(game):
+                    reporter.emit("skipped", game, message="já instalado")
+            games = [g for g in games if not manager.is_game_installed(g)]
+        failed = CommandLine.download(manager, reporter, games, args.jobs, args.bandwidth)
+        return 1 if failed else 0
+
+    @staticmethod
+    def download(manager, reporter, games, jobs, bandwidth):
+        """Baixa os jogos com até `jobs` downloads simultâneos; retorna os que falharam"""
+        if not games:
+            return []
+        
+        downloads = DownloadManager(max_concurrent=max(1, jobs), bandwidth_limit=bandwidth,
+                                    integrity=manager.integrity, store=manager.store, installs=manager.installs)
+        subscription = downloads.bus.subscribe()
+        by_key = {manager.install_key(game): game for game in games}
+        pending = set(by_key)
+        failed = []
+        last_report = {}
+        
+        for game in games:
+            downloads.enqueue(game)
+        
+        try:
+            while pending:
+                try:
+                    event = subscription.get(timeout=1)
+                except queue.Empty:
+                    continue
+                if event.key not in pending:
+                    continue
+                
+                game = by_key[event.key]
+                if event.status == "downloading":
+                    now = time.monotonic()
+                    if not event.total_size:
+                        continue
+                    if now - last_report.get(event.key, 0) < Config.CLI_PROGRESS_INTERVAL:
+                        continue
+                    last_report[event.key] = now
+                    percent = int(event.downloaded * 100 / event.total_size) if event.total_size else 0
+                    reporter.emit("progress", game, downloaded=event.downloaded, total=event.total_size,
+                                  message=f"{percent:>3}% {Utils.format_bytes(event.downloaded)}"
+                                          f" / {Utils.format_bytes(event.total_size)}")
+                elif event.status == "done":
+                    pending.discard(event.key)
+                    reporter.emit("installed", game, path=manager.exe_path(game), message="instalado")
+                elif event.status in ("failed", "paused"):
+                    pending.discard(event.key)
+                    failed.append(game)
+                    reporter.emit("failed", game, error=event.error or event.status,
+                                  message=event.error or DownloadJob.STATUS_TEXT[event.status])
+        except KeyboardInterrupt:
+            # Os downloads em andamento salvam o estado para retomar na próxima execução
+            downloads.shutdown()
+            while any(job.status == "downloading" for job in downloads.ordered_jobs()):
+                time.sleep(0.1)
+            raise
+        finally:
+            subscription.close()
+        return failed
+
+    @staticmethod
+    def verify(manager, reporter, workers):
+        """Recalcula o hash de todos os jogos instalados em processos paralelos; retorna os que falharam.
+        
+        Um arquivo ausente conta como falha, mas continua no índice para o repair reinstalá-lo.
+        """
+        installed = [g for g in manager.games if manager.is_game_installed(g)]
+        failed = []
+        futures = {}
+        
+        # Processos e não threads: o hash de arquivos grandes ocupa a CPU e cada núcleo pega um jogo
+        with ProcessPoolExecutor(max_workers=max(1, workers)) as pool, manager.integrity.batch():
+            for game in installed:
+                if not os.path.exists(manager.exe_path(game)):
+                    failed.append(game)
+                    reporter.emit("missing", game, message="arquivo ausente")
+                    continue
+                target = manager.verification_target(game)
+                if target is None:
+                    reporter.emit("unchecked", game, message="sem digest para comparar")
+                    continue
+                exe_path, algo, _ = target
+                futures[pool.submit(HashEngine.hash_file, exe_path, algo)] = (game, target)
+            
+            for future in as_completed(futures):
+                game, (exe_path, algo, expected) = futures[future]
+                try:
+                    digest = future.result()
+                except OSError as e:
+                    digest, error = None, str(e)
+                else:
+                    error = None
+                
+                if digest == expected:
+                    # Os próximos lançamentos não precisam refazer o hash
+                    manager.integrity.record(exe_path, algo, digest)
+                    reporter.emit("ok", game, algo=algo, message=f"{algo} ok")
+                else:
+                    manager.integrity.invalidate(exe_path)
+                    failed.append(game)
+                    reporter.emit("corrupted", game, algo=algo, error=error,
+                                  message=error or f"{algo} não confere")
+        
+        reporter.emit("verified", checked=len(installed), failed=len(failed),
+                      message=f"{len(installed)} verificado(s), {len(failed)} com erro")
+        return failed
+
+    @staticmethod
+    def repair(manager, reporter, args):
+        broken = CommandLine.verify(manager, reporter, args.workers)
+        # Arquivos corrompidos passam pela atualização por blocos antes do download completo
+        failed = CommandLine.download(manager, reporter, broken, args.jobs, args.bandwidth)
+        return 1 if failed else 0
+
 if __name__ == "__main__":
+    if CommandLine.requested(sys.argv[1:]):
+        sys.exit(CommandLine.run(sys.argv[1:]))
+    
+    startup = StartupTimer(StartupTimer.FLAG in sys.argv)
+    Profiler.configure(sys.argv)
+    
     if not Utils.is_admin():
         Utils.run_as_admin()
     
     try:
-        pygame.init()
         root = tk.Tk()
-        app = GameLauncherUI(root)
+        startup.mark("tk")
+        app = GameLauncherUI(root, startup=startup)
         root.mainloop()
     except Exception as e:
         print(f"Erro fatal: {e}")